@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+EOQ Pro - Benchmark e controllo regressioni (headless)
+------------------------------------------------------
+Misura throughput (righe/s) e picco di memoria (tracemalloc) dei percorsi critici:
+parse_number, eoq_only, rop_and_safety, eoq_batch, import CSV (riga per riga e `ingest_csv`), sensibilità,
+curve costi, report HTML, report PDF.
+
+  python bench_eoq.py --out bench.json                       # misura e salva
+  python bench_eoq.py --baseline base.json                   # confronta: exit 1 se peggiora oltre soglia
+  python bench_eoq.py --sizes 1000 100000 --cases eoq_batch html_report
+La baseline va misurata sulla stessa macchina (in CI: stesso job, commit di base e poi HEAD);
+i casi sotto --min-seconds sono solo informativi, troppo rumorosi per la soglia.
+"""
+import argparse, atexit, csv, io, json, os, platform, random, sys, tempfile, time, tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import eoq_core
+from eoq_core import (compute_rows, eoq_batch, eoq_only, format_result, iter_csv_rows, parse_number,
+                      rop_and_safety)
+from eoq_ingest import ingest_csv
+from eoq_report import write_html_report, write_pdf_report
+import eoq_sens
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+# Casi molto lenti per riga: limite di righe salvo --full
+MAX_ROWS = {"pdf_report": 100000, "sensitivity": 100000, "cost_curves": 100000}   # curve: righe × 101 punti × 2 matrici
+MIN_GATE_SECONDS = 0.01     # sotto: tempo dominato dal rumore, escluso dal confronto
+CSLS = (0.9, 0.95, 0.98, 0.99)
+BRAND = {"name": "EOQ Pro", "color": "#0F6FFF", "logo_path": ""}
+
+def _rows(n: int, seed: int = 0) -> List[Tuple[float, ...]]:
+    r = random.Random(seed)
+    return [(r.uniform(1, 1e5), r.uniform(1, 200), r.uniform(0.1, 10), float(r.randint(0, 30)),
+             r.uniform(0, 5), CSLS[i % len(CSLS)]) for i in range(n)]
+
+def _results(n: int) -> List[List[str]]:
+    out = []
+    for i, (D, S, H, L, sg, c) in enumerate(_rows(n), start=1):
+        Q, o, h, t = eoq_only(D, S, H); rop, ss = rop_and_safety(D, L, sg, c)
+        out.append(format_result((i, D, S, H, L, sg, c, Q, o, h, t, rop, ss)))
+    return out
+
+# Ogni caso: setup(n) -> dati (non misurato), run(dati) (misurato)
+def _setup_strings(n):
+    return [f"{D:.2f}".replace(".", ",") if i % 2 else f"{D:.2f}" for i, (D, *_) in enumerate(_rows(n))]
+def _run_parse(vals):
+    for v in vals: parse_number(v)
+
+def _run_eoq_only(rows):
+    for D, S, H, *_ in rows: eoq_only(D, S, H)
+
+def _run_rop(rows):
+    for D, _, _, L, sg, c in rows: rop_and_safety(D, L, sg, c)
+
+def _setup_columns(n):
+    cols = list(zip(*_rows(n)))
+    if eoq_core.HAS_NP:
+        np = eoq_core._load_np(); return [np.asarray(c) for c in cols]
+    return [list(c) for c in cols]
+def _run_batch(cols):
+    eoq_batch(*cols)
+
+def _setup_csv(n):
+    buf = io.StringIO(); w = csv.writer(buf, delimiter=";")
+    w.writerow(["D", "S", "H", "L", "sigma", "csl"])
+    for D, S, H, L, sg, c in _rows(n): w.writerow([f"{D:.2f}", f"{S:.2f}", f"{H:.3f}", f"{L:.0f}", f"{sg:.2f}", f"{c}".replace(".", ",")])
+    return buf.getvalue()
+def _run_csv(text):
+    for _ in compute_rows(iter_csv_rows(io.StringIO(text))): pass
+
+def _setup_csv_file(n):
+    fd, path = tempfile.mkstemp(suffix=".csv"); atexit.register(os.remove, path)
+    with os.fdopen(fd, "w", encoding="utf-8", newline="") as f: f.write(_setup_csv(n))
+    return path
+def _run_ingest(path):
+    ingest_csv(path, workers=1)
+def _run_ingest_auto(path):
+    ingest_csv(path)   # processi paralleli sopra INGEST_PARALLEL_MIN_BYTES (memoria dei figli non misurata)
+
+def _run_curves(cols):
+    eoq_sens.cost_curves(*cols[:3])
+
+def _run_sens(rows):
+    eoq_sens.cache_clear(); eoq_sens.sensitivity(rows)
+
+def _run_html(rows):
+    with open(os.devnull, "w", encoding="utf-8") as f: write_html_report(f, rows, BRAND, "bench")
+
+def _run_pdf(rows):
+    write_pdf_report(os.devnull, rows, BRAND, "bench")
+
+CASES: Dict[str, Tuple[Callable, Callable]] = {
+    "parse_number": (_setup_strings, _run_parse),
+    "eoq_only": (_rows, _run_eoq_only),
+    "rop_and_safety": (_rows, _run_rop),
+    "eoq_batch": (_setup_columns, _run_batch),
+    "csv_import": (_setup_csv, _run_csv),
+    "csv_ingest": (_setup_csv_file, _run_ingest),
+    "csv_ingest_auto": (_setup_csv_file, _run_ingest_auto),
+    "sensitivity": (_rows, _run_sens),
+    "cost_curves": (_setup_columns, _run_curves),
+    "html_report": (_results, _run_html),   # stesso motore di EOQProSimple._build_html
+    "pdf_report": (_results, _run_pdf),
+}
+
+def _available(case: str) -> bool:
+    if case == "pdf_report":
+        from importlib.util import find_spec
+        return find_spec("reportlab") is not None
+    return True
+
+def run_case(case: str, n: int, repeat: int = 3) -> Dict[str, float]:
+    setup, run = CASES[case]
+    data = setup(n)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); run(data); best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        run(data); peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"rows": n, "seconds": round(best, 6), "rows_per_sec": round(n / best if best > 0 else 0.0, 1),
+            "peak_mb": round(peak / 1e6, 3)}
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            min_seconds: float = MIN_GATE_SECONDS) -> List[str]:
+    """Regressioni: throughput sotto (1 - soglia) o memoria sopra (1 + soglia) rispetto alla baseline.
+
+    Casi presenti solo da una parte o più veloci di `min_seconds` (in entrambe le misure) non sono confrontati.
+    """
+    bad = []
+    for key, b in baseline.items():
+        c = current.get(key)
+        if not c or max(b["seconds"], c["seconds"]) < min_seconds: continue
+        if c["rows_per_sec"] < b["rows_per_sec"] * (1.0 - threshold):
+            bad.append(f"{key}: {c['rows_per_sec']:,.0f} righe/s < baseline {b['rows_per_sec']:,.0f}")
+        if c["peak_mb"] > b["peak_mb"] * (1.0 + threshold) + 1.0:   # 1 MB di tolleranza assoluta
+            bad.append(f"{key}: picco {c['peak_mb']:.1f} MB > baseline {b['peak_mb']:.1f} MB")
+    return bad
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark EOQ Pro (headless).")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    ap.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    ap.add_argument("--repeat", type=int, default=3, help="ripetizioni per caso, vale la migliore")
+    ap.add_argument("--full", action="store_true", help="ignora i limiti di righe per i casi lenti (PDF)")
+    ap.add_argument("--out", help="salva i risultati JSON (utilizzabile come baseline)")
+    ap.add_argument("--baseline", help="JSON di riferimento da confrontare")
+    ap.add_argument("--threshold", type=float, default=0.25, help="peggioramento tollerato (0.25 = 25%%)")
+    ap.add_argument("--min-seconds", type=float, default=MIN_GATE_SECONDS,
+                    help="casi più rapidi esclusi dal confronto (default %(default)s s)")
+    a = ap.parse_args(argv)
+    results: Dict[str, Dict] = {}
+    for case in a.cases:
+        if not _available(case): print(f"{case}: saltato (dipendenza mancante)", file=sys.stderr); continue
+        for n in a.sizes:
+            if not a.full and n > MAX_ROWS.get(case, n): continue
+            r = run_case(case, n, a.repeat); results[f"{case}@{n}"] = r
+            print(f"{case:>15} {n:>9}  {r['seconds']:9.3f}s  {r['rows_per_sec']:>14,.0f} righe/s  picco {r['peak_mb']:8.1f} MB")
+    doc = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                    "numpy": eoq_core.HAS_NP, "at": time.strftime("%Y-%m-%dT%H:%M:%S")}, "results": results}
+    if a.out:
+        with open(a.out, "w", encoding="utf-8") as f: json.dump(doc, f, indent=2)
+    if a.baseline:
+        with open(a.baseline, "r", encoding="utf-8") as f: base = json.load(f)
+        bad = compare(results, base.get("results", {}), a.threshold, a.min_seconds)
+        for b in bad: print("REGRESSIONE " + b, file=sys.stderr)
+        if bad: return 1
+        print(f"Nessuna regressione oltre il {a.threshold:.0%} rispetto a {a.baseline}.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
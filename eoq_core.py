@@ -0,0 +1,520 @@
+# -*- coding: utf-8 -*-
+"""
+EOQ Pro - Motore di calcolo (headless)
+--------------------------------------
+- EOQ, costi, ROP, Scorta di Sicurezza (riga singola e batch vettoriale)
+- Modalità CLI: python eoq_pro.py batch in.csv out.csv
+- Progetto binario colonnare (.eoqp) apribile in memory-map
+Nessuna dipendenza da tkinter/matplotlib/reportlab.
+"""
+import argparse, contextlib, csv, io, json, math, mmap, os, struct, sys, time
+from array import array
+from functools import lru_cache
+from importlib.util import find_spec
+from statistics import NormalDist
+from typing import Tuple, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+# NumPy è opzionale e pesante da importare: si verifica solo la presenza, l'import avviene al primo uso
+HAS_NP = find_spec("numpy") is not None
+np = None
+
+def _load_np():
+    global np
+    if np is None:
+        import numpy  # type: ignore
+        np = numpy
+    return np
+
+Z_BY_CSL = {0.80: 0.8416, 0.90: 1.2816, 0.95: 1.6449, 0.975: 1.9600, 0.99: 2.3263, 0.995: 2.5758}
+Z_CACHE_SIZE = 4096
+Z_QUANTUM = 9  # decimali: CSL che differiscono solo per rumore float condividono la cache
+
+@lru_cache(maxsize=Z_CACHE_SIZE)
+def _z_cached(csl_q: float) -> float:
+    return NormalDist().inv_cdf(csl_q)
+
+def z_for_csl(csl: float) -> float:
+    """z = Φ⁻¹(CSL) esatto (qualsiasi 0 < CSL < 1), memoizzato per CSL quantizzato."""
+    return _z_cached(round(csl, Z_QUANTUM))
+
+def z_for_csl_array(csl):
+    """Versione per colonne: una sola inversione per ciascun CSL distinto."""
+    if HAS_NP and not isinstance(csl, list):
+        _load_np()
+        uniq, inv = np.unique(np.round(np.asarray(csl, dtype=np.float64), Z_QUANTUM), return_inverse=True)
+        return np.array([_z_cached(u) for u in uniq.tolist()])[inv.reshape(-1)]
+    return [z_for_csl(c) for c in csl]
+
+NONFINITE_MSG = "valore non finito"   # nan, inf: per parse_row un valore presente, mai "mancante"
+
+def parse_number(value: str, allow_zero: bool = False) -> float:
+    s = (value or "").strip().replace(",", ".")
+    if s == "": raise ValueError("vuoto")
+    x = float(s)
+    if not math.isfinite(x): raise ValueError(NONFINITE_MSG)
+    if allow_zero:
+        if x < 0: raise ValueError("<0")
+    else:
+        if x <= 0: raise ValueError("<=0")
+    return x
+
+def eoq_only(D: float, S: float, H: float) -> Tuple[float, float, float, float]:
+    Q = math.sqrt((2.0 * D * S) / H)
+    cost_order = (D / Q) * S
+    cost_hold = (Q / 2.0) * H
+    return Q, cost_order, cost_hold, cost_order + cost_hold
+
+def eoq_costs(D, S, H, Q):
+    """Costi (ordinazione, mantenimento, totale) per un Q dato; elemento per elemento su array NumPy."""
+    cost_order = D / Q * S
+    cost_hold = Q / 2.0 * H
+    return cost_order, cost_hold, cost_order + cost_hold
+
+def rop_and_safety(D: float, L_days: float, sigma_d: float = 0.0, csl: float = 0.95) -> Tuple[float, float]:
+    mu_d = D / 365.0
+    z = z_for_csl(csl)
+    ss = (z * sigma_d * math.sqrt(max(L_days, 0.0))) if sigma_d > 0 and L_days > 0 else 0.0
+    rop = mu_d * max(L_days, 0.0) + ss
+    return rop, ss
+
+# Batch: colonne (D, S, H, L, sigma, csl) -> colonne risultato + maschera righe valide
+BATCH_COLS = ("Q", "cost_order", "cost_hold", "cost_total", "rop", "ss")
+
+def eoq_batch(D: Sequence[float], S: Sequence[float], H: Sequence[float],
+              L: Optional[Sequence[float]] = None, sigma: Optional[Sequence[float]] = None,
+              csl: Optional[Sequence[float]] = None, use_numpy: Optional[bool] = None) -> Dict[str, object]:
+    """EOQ, costi, ROP e scorta di sicurezza per intere colonne in un solo passaggio.
+
+    L/sigma/csl mancanti (None o NaN) valgono 0, 0 e 0.95 come in `_calc`. Le righe non
+    valide non sollevano eccezioni: hanno risultati NaN e `ok` False.
+    Restituisce array NumPy se disponibile (o `use_numpy=True`), altrimenti liste.
+    """
+    if use_numpy is None: use_numpy = HAS_NP
+    if use_numpy: return _eoq_batch_np(D, S, H, L, sigma, csl)
+    return _eoq_batch_py(D, S, H, L, sigma, csl)
+
+def _eoq_batch_np(D, S, H, L, sigma, csl) -> Dict[str, object]:
+    _load_np()
+    D = np.asarray(D, dtype=np.float64); S = np.asarray(S, dtype=np.float64); H = np.asarray(H, dtype=np.float64)
+    n = D.shape[0]
+    def opt(col, default):
+        if col is None: return np.full(n, default)
+        a = np.asarray(col, dtype=np.float64)
+        return np.where(np.isnan(a), default, a)
+    L = opt(L, 0.0); sigma = opt(sigma, 0.0); csl = opt(csl, 0.95)
+    ok = (D > 0) & (S > 0) & (H > 0) & (L >= 0) & (sigma >= 0) & (csl > 0.5) & (csl < 0.9999)
+    ok &= np.isfinite(D) & np.isfinite(S) & np.isfinite(H) & np.isfinite(L) & np.isfinite(sigma)
+    # Valori neutri sulle righe non valide: nessun warning, poi NaN nel risultato
+    D = np.where(ok, D, 1.0); S = np.where(ok, S, 1.0); H = np.where(ok, H, 1.0)
+    L = np.where(ok, L, 0.0); sigma = np.where(ok, sigma, 0.0); csl = np.where(ok, csl, 0.95)
+    Q = np.sqrt(2.0 * D * S / H)
+    c_ord = D / Q * S
+    c_hold = Q * 0.5 * H
+    ss = z_for_csl_array(csl) * sigma * np.sqrt(L)
+    rop = D / 365.0 * L + ss
+    out = {"Q": Q, "cost_order": c_ord, "cost_hold": c_hold, "cost_total": c_ord + c_hold, "rop": rop, "ss": ss}
+    bad = ~ok
+    for a in out.values(): a[bad] = np.nan
+    out["ok"] = ok
+    return out
+
+def _eoq_batch_py(D, S, H, L, sigma, csl) -> Dict[str, object]:
+    n = len(D); nan = float("nan")
+    def opt(col, default):
+        if col is None: return [default] * n
+        return [default if (x is None or x != x) else float(x) for x in col]
+    L = opt(L, 0.0); sigma = opt(sigma, 0.0); csl = opt(csl, 0.95)
+    out: Dict[str, List] = {k: [nan] * n for k in BATCH_COLS}
+    ok = [False] * n
+    Qs, Os, Hs, Ts, Rs, SSs = (out[k] for k in BATCH_COLS)
+    for i in range(n):
+        try:
+            d, s, h = float(D[i]), float(S[i]), float(H[i])
+            l, sg, c = L[i], sigma[i], csl[i]
+            if not (d > 0 and s > 0 and h > 0 and l >= 0 and sg >= 0 and 0.5 < c < 0.9999): continue
+            if math.isinf(d + s + h + l + sg): continue
+            Qs[i], Os[i], Hs[i], Ts[i] = eoq_only(d, s, h)
+            Rs[i], SSs[i] = rop_and_safety(d, l, sg, c)
+            ok[i] = True
+        except (TypeError, ValueError):
+            continue
+    out["ok"] = ok
+    return out
+
+# Righe di input / risultati (stesso formato di Import/Export CSV)
+FIELDS = ("D", "S", "H", "L", "sigma", "csl")
+RESULT_HEADER = ["Riga","D","S","H","L","sigma","CSL","EOQ","Costo_ordinazione","Costo_mantenimento","Costo_totale","ROP","Safety_Stock"]
+HEADER_NAMES = ("d","domanda","s","h","l","sigma","csl")
+
+PLAN_BLOCKED_MSG = "piano non calcolato: correggere le righe in errore"   # righe valide con pianificazione sospesa
+
+def parse_row(raw: Sequence[str]) -> Tuple[float, float, float, float, float, float]:
+    """Valida una riga D;S;H;L;sigma;csl (stringhe) con le stesse regole di `_calc`."""
+    D = parse_number(raw[0]); S = parse_number(raw[1]); H = parse_number(raw[2])
+    L = parse_number(raw[3], allow_zero=True) if raw[3].strip() else 0.0
+    sigma = parse_number(raw[4], allow_zero=True) if raw[4].strip() else 0.0
+    c = raw[5].strip()
+    csl = float(c.replace(",", ".")) if c else 0.95
+    if not math.isfinite(csl): raise ValueError(NONFINITE_MSG)
+    if not (0.5 < csl < 0.9999): raise ValueError("CSL fuori range (0.5–0.999)")
+    return D, S, H, L, sigma, csl
+
+def format_result(row: Sequence[float]) -> List[str]:
+    """(idx, D, S, H, L, sigma, csl, Q, ord, hold, tot, rop, ss) -> valori formattati per tabella/CSV."""
+    return [row[0], f"{row[1]:.2f}", f"{row[2]:.2f}", f"{row[3]:.2f}", f"{row[4]:.2f}", f"{row[5]:.2f}",
+            f"{row[6]:.3f}", f"{row[7]:.2f}", f"{row[8]:.2f}", f"{row[9]:.2f}", f"{row[10]:.2f}",
+            f"{row[11]:.2f}", f"{row[12]:.2f}"]
+
+def iter_csv_rows(f: TextIO, delimiter: str = ";") -> Iterator[List[str]]:
+    """Righe grezze (6 campi, padding con "") saltando l'eventuale intestazione."""
+    reader = csv.reader(f, delimiter=delimiter)
+    for i, r in enumerate(reader):
+        if i == 0 and r and any(h.strip().lower() in HEADER_NAMES for h in r): continue
+        yield (r + ["","","","","",""])[:6]
+
+def read_tiers_csv(f: TextIO, delimiter: str = ";") -> Dict[int, List[Tuple[float, float]]]:
+    """Listini prezzi da CSV riga;qta_min;prezzo (riga 1-based) -> {indice 0-based: [(qta_min, prezzo), ...]}."""
+    tiers: Dict[int, List[Tuple[float, float]]] = {}
+    for n, r in enumerate(csv.reader(f, delimiter=delimiter), start=1):
+        if not r or not any(v.strip() for v in r): continue
+        if n == 1 and not r[0].strip().isdigit(): continue   # intestazione
+        try:
+            row = int(r[0]); qmin = parse_number(r[1], allow_zero=True); price = parse_number(r[2])
+            if row < 1: raise ValueError("riga <1")
+        except (IndexError, ValueError) as ex:
+            raise ValueError(f"Listino, linea {n}: {ex}")
+        tiers.setdefault(row - 1, []).append((qmin, price))
+    return tiers
+
+def compute_rows(rows: Iterable[Sequence[str]], chunk_size: int = 65536,
+                 errors: Optional[List[str]] = None, max_errors: int = 1000) -> Iterator[tuple]:
+    """Calcola righe grezze a blocchi con `eoq_batch`; memoria costante rispetto all'input.
+
+    Produce tuple (idx, D, S, H, L, sigma, csl, Q, ord, hold, tot, rop, ss) solo per le righe
+    valide; i messaggi "Riga N: ..." finiscono in `errors` (al massimo `max_errors`).
+    """
+    idxs: List[int] = []; cols: Tuple[List[float], ...] = ([], [], [], [], [], [])
+    def flush():
+        res = eoq_batch(*cols)
+        out = [res[k] for k in BATCH_COLS]; ok = res["ok"]
+        if HAS_NP: out = [a.tolist() for a in out]; ok = ok.tolist()
+        # parse_row scarta già nan/inf; la maschera `ok` resta come rete per valori fuori dominio
+        for r, good in zip(zip(idxs, *cols, *out), ok):
+            if good: yield r
+            elif errors is not None and len(errors) < max_errors: errors.append(f"Riga {r[0]}: {NONFINITE_MSG}")
+        idxs.clear()
+        for c in cols: c.clear()
+    for idx, raw in enumerate(rows, start=1):
+        if not any(v.strip() for v in raw): continue
+        try:
+            vals = parse_row(raw)
+        except Exception as ex:
+            if errors is not None and len(errors) < max_errors: errors.append(f"Riga {idx}: {ex}")
+            continue
+        idxs.append(idx)
+        for c, v in zip(cols, vals): c.append(v)
+        if len(idxs) >= chunk_size: yield from flush()
+    if idxs: yield from flush()
+
+# Modello a colonne per l'editor: stringhe di input + cache risultati per riga
+class RowModel:
+    """Righe di input come colonne di stringhe, con risultati in cache e righe sporche.
+
+    `set` marca sporca solo la riga toccata; `recompute` ricalcola (in un'unica chiamata a
+    `eoq_batch`) solo le righe sporche e restituisce gli indici cambiati.
+    """
+    def __init__(self, n: int = 0):
+        self.clear(n)
+
+    def clear(self, n: int = 0):
+        self.cols: Dict[str, List[str]] = {k: [""] * n for k in FIELDS}
+        self.results: List[Optional[tuple]] = [None] * n
+        self.errors: Dict[int, str] = {}
+        self.dirty = set(range(n)); self.source: Optional[str] = None
+        self._reset_options()
+
+    def _reset_options(self):
+        # Listini prezzi (sconti quantità) per riga: {indice: [(qta_min, prezzo), ...]}
+        self.tiers: Dict[int, List[Tuple[float, float]]] = {}
+        self.tier_mode = "all"; self.holding_rate = 0.0
+        # Pianificazione multi-periodo (righe = periodi): None, "ww" o "sm" (vedi eoq_solver.LOT_METHODS)
+        self.plan_method: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def load(self, rows: Iterable[Sequence[str]]):
+        """Caricamento in blocco (import/apertura progetto): una colonna alla volta, niente widget."""
+        cols: List[List[str]] = [[] for _ in FIELDS]
+        for r in rows:
+            for c, v in zip(cols, r): c.append(v)
+        n = len(cols[0])
+        self.cols = dict(zip(FIELDS, cols)); self.results = [None] * n
+        self.errors = {}; self.dirty = set(range(n)); self.source = None
+        self._reset_options()
+
+    def set_tiers(self, tiers: Dict[int, List[Tuple[float, float]]], mode: str = "all", holding_rate: float = 0.0):
+        """Imposta i listini (righe 0-based); ricalcolo solo per le righe con listino vecchio o nuovo."""
+        self.dirty.update(i for i in set(self.tiers) | set(tiers) if i < len(self))
+        self.tiers = {i: list(t) for i, t in tiers.items()}; self.tier_mode = mode; self.holding_rate = holding_rate
+
+    def set_plan(self, method: Optional[str]):
+        """Attiva/disattiva il lot sizing multi-periodo: ogni riga dipende da tutte, si ricalcola tutto."""
+        self.plan_method = method or None; self.dirty.update(range(len(self)))
+
+    def append(self, vals: Optional[Sequence[str]] = None):
+        for k, v in zip(FIELDS, vals or ("",) * len(FIELDS)): self.cols[k].append(v)
+        self.results.append(None); self.dirty.add(len(self.results) - 1)
+
+    def row(self, i: int) -> List[str]:
+        return [self.cols[k][i] for k in FIELDS]
+
+    def set(self, i: int, field: str, value: str) -> bool:
+        col = self.cols[field]
+        if col[i] == value: return False
+        col[i] = value; self.dirty.add(i)
+        return True
+
+    def is_blank(self, i: int) -> bool:
+        return not any(self.cols[k][i].strip() for k in FIELDS)
+
+    def has_data(self) -> bool:
+        return any(v.strip() for k in FIELDS for v in self.cols[k])
+
+    def recompute(self, force: bool = False) -> List[int]:
+        if self.plan_method and self.dirty: force = True
+        idxs = list(range(len(self))) if force else sorted(self.dirty)
+        self.dirty.clear()
+        ok_idx: List[int] = []; vals: List[tuple] = []
+        for i in idxs:
+            self.results[i] = None; self.errors.pop(i, None)
+            if self.is_blank(i): continue
+            try:
+                vals.append(parse_row(self.row(i))); ok_idx.append(i)
+            except Exception as ex:
+                self.errors[i] = str(ex)
+        if ok_idx:
+            cols = list(zip(*vals))
+            res = eoq_batch(*cols)
+            out = [res[k] for k in BATCH_COLS]
+            if HAS_NP and not isinstance(out[0], list): out = [a.tolist() for a in out]
+            for i, good in zip(ok_idx, res["ok"]):
+                if not good: self.errors[i] = NONFINITE_MSG
+            if self.tiers: self._apply_tiers(ok_idx, vals, out)
+            if self.plan_method:
+                # Righe = periodi: con righe in errore il piano salterebbe dei periodi, quindi niente piano
+                if self.errors:
+                    for i in ok_idx: self.errors.setdefault(i, PLAN_BLOCKED_MSG)
+                else: self._apply_plan(vals, out)
+            for i, v, r in zip(ok_idx, vals, zip(*out)):
+                if i not in self.errors: self.results[i] = (i + 1,) + v + r
+        return idxs
+
+    def options_meta(self) -> Dict[str, object]:
+        return {"tiers": {str(i): [list(x) for x in t] for i, t in self.tiers.items()},
+                "tier_mode": self.tier_mode, "holding_rate": self.holding_rate, "plan_method": self.plan_method}
+
+    def load_options_meta(self, meta: Dict[str, object]):
+        self.tiers = {int(i): [tuple(x) for x in t] for i, t in meta.get("tiers", {}).items()}
+        self.tier_mode = meta.get("tier_mode", "all"); self.holding_rate = float(meta.get("holding_rate", 0.0))
+        self.plan_method = meta.get("plan_method") or None
+
+    def _apply_tiers(self, ok_idx: List[int], vals: List[tuple], out: List[list]):
+        # Righe con listino: Q e costi da price_break_batch (Totale include l'acquisto), ROP/SS invariati
+        from eoq_solver import price_break_batch, tiers_to_csr
+        pos = [j for j, i in enumerate(ok_idx) if i in self.tiers]
+        if not pos: return
+        br, pr, off = tiers_to_csr([self.tiers[ok_idx[j]] for j in pos])
+        D, S, H = ([vals[j][c] for j in pos] for c in range(3))
+        res = price_break_batch(D, S, H, br, pr, off, self.holding_rate, self.tier_mode)
+        for n, j in enumerate(pos):
+            if not res["ok"][n]: self.errors[ok_idx[j]] = "listino prezzi non valido"; continue
+            out[0][j] = float(res["Q"][n]); out[1][j] = float(res["cost_order"][n])
+            out[2][j] = float(res["cost_hold"][n]); out[3][j] = float(res["cost_total"][n])
+
+    def _apply_plan(self, vals: List[tuple], out: List[list]):
+        # Tutte le righe non vuote in ordine = periodi (nessuna in errore): EOQ -> lotto del periodo, costi del periodo (senza acquisto), ROP/SS invariati
+        from eoq_solver import lot_plan
+        plan = lot_plan([v[0] for v in vals], [v[1] for v in vals], [v[2] for v in vals], self.plan_method)
+        for j, k in enumerate(("Q", "cost_order", "cost_hold", "cost_total")): out[j][:] = plan[k]
+
+    def materialize(self):
+        """Copia in memoria le colonne lazy (necessario prima di sovrascrivere il file sorgente)."""
+        self.cols = {k: list(v) for k, v in self.cols.items()}; self.results = list(self.results)
+        self.source = None
+
+    def result_rows(self) -> Iterator[tuple]:
+        """Risultati delle righe valide, in ordine: (idx, D, S, H, L, sigma, csl, Q, ord, hold, tot, rop, ss)."""
+        return (r for r in self.results if r is not None)
+
+    def result_indices(self) -> List[int]:
+        present = getattr(self.results, "is_present", None)
+        if present: return [i for i in range(len(self)) if present(i)]
+        return [i for i, r in enumerate(self.results) if r is not None]
+
+    def has_results(self) -> bool:
+        return any(r is not None for r in self.results)
+
+# Progetto binario (.eoqp): header + meta JSON + colonne float64 (memory-mapped in apertura)
+PROJECT_MAGIC = b"EOQP"
+PROJECT_VERSION = 1
+_PROJ_HEADER = struct.Struct("<4sHHQI4x")   # magic, versione, flag, righe, lunghezza meta
+_FLAG_RESULTS = 1
+# Stato per riga nella colonna "state": 0 = da calcolare, 1 = risultato in cache, 2 = errore
+_ST_DIRTY, _ST_OK, _ST_ERR = 0.0, 1.0, 2.0
+
+class LazyColumn:
+    """Sequenza letta su richiesta da una sorgente (es. colonna mmap); modifiche in un dict, nuove righe in coda."""
+    def __init__(self, n: int, getter, overrides: Optional[Dict[int, object]] = None, present=None):
+        self._n = n; self._get = getter; self._set = overrides or {}; self._extra: List[object] = []
+        self._present = present
+    def __len__(self) -> int:
+        return self._n + len(self._extra)
+    def __getitem__(self, i: int):
+        if i < 0: i += len(self)
+        if i < 0: raise IndexError(i)
+        if i >= self._n: return self._extra[i - self._n]
+        if i in self._set: return self._set[i]
+        return self._get(i)
+    def __setitem__(self, i: int, v):
+        if i < 0: i += len(self)
+        if i < 0: raise IndexError(i)
+        if i >= self._n: self._extra[i - self._n] = v
+        else: self._set[i] = v
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+    def append(self, v):
+        self._extra.append(v)
+    def is_present(self, i: int) -> bool:
+        """`self[i] is not None` senza costruire il valore, se la sorgente lo permette."""
+        if self._present is None or i >= self._n or i in self._set: return self[i] is not None
+        return self._present(i)
+
+def _num_str(x: float) -> str:
+    if x != x: return ""
+    return str(int(x)) if x.is_integer() and abs(x) < 1e15 else repr(x)
+
+def _float_cols(mm, offset: int, n: int, k: int) -> List[Sequence[float]]:
+    cols = []
+    for j in range(k):
+        start = offset + j * n * 8
+        if sys.byteorder == "little":
+            cols.append(memoryview(mm)[start:start + n * 8].cast("d"))
+        else:
+            a = array("d"); a.frombytes(mm[start:start + n * 8]); a.byteswap(); cols.append(a)
+    return cols
+
+def _write_col(f, values: Iterable[float]):
+    a = array("d", values)
+    if sys.byteorder != "little": a.byteswap()
+    f.write(a.tobytes())
+
+def save_project_bin(path: str, model: "RowModel", meta: Optional[Dict[str, object]] = None):
+    """Scrive il progetto in formato colonnare; i risultati in cache vengono salvati con gli input."""
+    n = len(model); texts: Dict[str, List[str]] = {}; state: List[float] = []
+    inputs: List[List[float]] = [[] for _ in FIELDS]
+    for i in range(n):
+        raw = model.row(i); bad = False
+        for c, v in zip(inputs, raw):
+            v = v.strip()
+            try: c.append(float(v.replace(",", ".")) if v else math.nan)
+            except ValueError: c.append(math.nan); bad = True
+        if bad: texts[str(i)] = list(raw)
+        state.append(_ST_DIRTY if i in model.dirty else _ST_ERR if i in model.errors
+                     else _ST_OK if model.results[i] is not None else _ST_DIRTY)
+    meta = dict(meta or {}); meta.update(model.options_meta()); meta.update({"fields": list(FIELDS), "results": list(BATCH_COLS), "texts": texts,
+                                          "errors": {str(i): m for i, m in model.errors.items() if i not in model.dirty}})
+    mb = json.dumps(meta, ensure_ascii=False).encode("utf-8"); mb += b" " * (-len(mb) % 8)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PROJ_HEADER.pack(PROJECT_MAGIC, PROJECT_VERSION, _FLAG_RESULTS, n, len(mb))); f.write(mb)
+        for c in inputs: _write_col(f, c)
+        del inputs
+        _write_col(f, state)
+        nan = math.nan
+        for j in range(len(BATCH_COLS)):
+            _write_col(f, (nan if r is None else r[7 + j] for r in model.results))
+    os.replace(tmp, path)
+
+def open_project_bin(path: str) -> Tuple["RowModel", Dict[str, object]]:
+    """Apre un .eoqp in memory-map: le righe vengono lette solo quando servono (editor, export)."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    if len(mm) < _PROJ_HEADER.size: raise ValueError("file progetto troppo corto")
+    magic, ver, flags, n, mlen = _PROJ_HEADER.unpack_from(mm, 0)
+    if magic != PROJECT_MAGIC: raise ValueError("non è un progetto EOQ Pro")
+    if ver > PROJECT_VERSION: raise ValueError(f"versione progetto {ver} non supportata")
+    meta = json.loads(bytes(mm[_PROJ_HEADER.size:_PROJ_HEADER.size + mlen]).decode("utf-8"))
+    off = _PROJ_HEADER.size + mlen
+    ncols = len(FIELDS) + 1 + (len(BATCH_COLS) if flags & _FLAG_RESULTS else 0)
+    if len(mm) < off + ncols * n * 8: raise ValueError("file progetto troncato")
+    cols = _float_cols(mm, off, n, ncols)
+    inputs, state, res = cols[:len(FIELDS)], cols[len(FIELDS)], cols[len(FIELDS) + 1:]
+    m = _columnar_model(inputs, state, res, {int(i): v for i, v in meta.get("texts", {}).items()},
+                        {int(i): msg for i, msg in meta.get("errors", {}).items()})
+    m.source = path; m.load_options_meta(meta)
+    return m, meta
+
+def _columnar_model(inputs: Sequence[Sequence[float]], state: Sequence[float], res: Sequence[Sequence[float]],
+                    texts: Optional[Dict[int, List[str]]] = None, errors: Optional[Dict[int, str]] = None) -> "RowModel":
+    """RowModel su colonne float (input NaN = vuoto, stato, risultati): stringhe e tuple costruite su richiesta."""
+    n = len(state); texts = texts or {}
+    m = RowModel()
+    m.cols = {k: LazyColumn(n, (lambda i, c=c: _num_str(c[i])), {i: t[j] for i, t in texts.items()})
+              for j, (k, c) in enumerate(zip(FIELDS, inputs))}
+    def result(i: int) -> Optional[tuple]:
+        if state[i] != _ST_OK or not res: return None
+        D, S, H, L, sg, c = (x[i] for x in inputs)
+        return (i + 1, D, S, H, 0.0 if L != L else L, 0.0 if sg != sg else sg, 0.95 if c != c else c) + tuple(x[i] for x in res)
+    m.results = LazyColumn(n, result, present=lambda i: bool(res) and state[i] == _ST_OK)
+    m.errors = dict(errors or {})
+    # Righe vuote (tutti gli input NaN, nessun testo): niente da calcolare, non restano sporche all'apertura
+    blank = lambda i: i not in texts and all(c[i] != c[i] for c in inputs)
+    m.dirty = {i for i, s in enumerate(state) if (s == _ST_DIRTY and not blank(i)) or (s == _ST_OK and not res)}
+    return m
+
+def run_batch(src: TextIO, dst: TextIO, delimiter: str = ";", chunk_size: int = 65536,
+              errors: Optional[List[str]] = None) -> Dict[str, float]:
+    """Legge CSV D;S;H;L;sigma;csl da `src` e scrive i risultati su `dst` in streaming."""
+    t0 = time.perf_counter(); n_in = 0; n_blank = 0; n_ok = 0
+    def counted(it):
+        nonlocal n_in, n_blank
+        for r in it:
+            n_in += 1
+            if not any(v.strip() for v in r): n_blank += 1
+            yield r
+    w = csv.writer(dst, delimiter=delimiter)
+    w.writerow(RESULT_HEADER)
+    errs: List[str] = [] if errors is None else errors
+    for row in compute_rows(counted(iter_csv_rows(src, delimiter)), chunk_size, errs):
+        w.writerow(format_result(row)); n_ok += 1
+    dt = time.perf_counter() - t0
+    return {"rows": n_in, "valid": n_ok, "errors": n_in - n_blank - n_ok, "seconds": dt, "rows_per_sec": n_in / dt if dt > 0 else 0.0}
+
+def run_batch_file(in_path: str, out_path: str, **kw) -> Dict[str, float]:
+    with open(in_path, "r", encoding="utf-8", newline="") as src, open(out_path, "w", encoding="utf-8", newline="") as dst:
+        return run_batch(src, dst, **kw)
+
+def cli_batch(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="eoq_pro.py batch", description="Calcolo EOQ/ROP headless da CSV (D;S;H;L;sigma;csl).")
+    ap.add_argument("input", help="CSV di input ('-' = stdin)")
+    ap.add_argument("output", help="CSV dei risultati ('-' = stdout)")
+    ap.add_argument("--delimiter", default=";")
+    ap.add_argument("--chunk-size", type=int, default=65536)
+    ap.add_argument("--max-errors", type=int, default=20, help="errori di riga mostrati su stderr")
+    a = ap.parse_args(argv)
+    errors: List[str] = []
+    try:
+        with contextlib.ExitStack() as stack:
+            src = stack.enter_context(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="") if a.input == "-"
+                                      else open(a.input, "r", encoding="utf-8", newline=""))
+            dst = stack.enter_context(io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="") if a.output == "-"
+                                      else open(a.output, "w", encoding="utf-8", newline=""))
+            stats = run_batch(src, dst, a.delimiter, a.chunk_size, errors)
+    except OSError as ex:
+        print(f"Errore: {ex}", file=sys.stderr); return 2
+    for e in errors[:a.max_errors]: print(e, file=sys.stderr)
+    print(f"Righe: {stats['rows']}  valide: {stats['valid']}  errori: {stats['errors']}  "
+          f"tempo: {stats['seconds']:.2f}s  ({stats['rows_per_sec']:,.0f} righe/s)", file=sys.stderr)
+    return 1 if stats["valid"] == 0 and stats["rows"] > 0 else 0
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+EOQ Pro - Import CSV veloce (headless)
+--------------------------------------
+- File diviso in blocchi su confini di riga, blocchi analizzati in parallelo (ProcessPoolExecutor)
+- Ogni blocco diventa direttamente colonne float64 (array "d"), niente liste di stringhe
+- Separatore (; tab | ,) rilevato automaticamente; decimali con virgola o punto come `parse_number`
+- Stesse regole di `parse_row` (parse_number, valori finiti, range CSL): la via veloce accetta solo
+  righe sicuramente valide, tutto il resto passa da `parse_row` e ne riceve lo stesso errore
+Limite: i blocchi sono tagliati su "\\n", quindi campi tra virgolette con a capo non sono supportati.
+"""
+import csv, io, math, multiprocessing, os, time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from eoq_core import (BATCH_COLS, FIELDS, HAS_NP, HEADER_NAMES, NONFINITE_MSG, RowModel, _ST_DIRTY, _ST_ERR, _ST_OK,
+                      _columnar_model, _load_np, eoq_batch, parse_row)
+
+DELIMITERS = (";", "\t", "|", ",")     # ordine di preferenza a parità di coerenza
+SNIFF_BYTES = 64 * 1024
+INGEST_CHUNK_BYTES = 8 << 20           # byte per blocco
+INGEST_PARALLEL_MIN_BYTES = 16 << 20   # sotto questa soglia niente processi (avvio spawn più lento del parsing)
+_PAD = ("",) * len(FIELDS)
+
+def sniff_csv(sample: str) -> str:
+    """Separatore da un campione di testo; default ";".
+
+    Vince il primo separatore di DELIMITERS con lo stesso numero di occorrenze (>0) su almeno
+    il 90% delle righe. Il separatore decimale non serve: ogni cella accetta virgola o punto.
+    """
+    lines = [ln for ln in sample.replace("\r\n", "\n").split("\n")[:50] if ln.strip()]
+    delim = ";"
+    for d in DELIMITERS:
+        counts = Counter(ln.count(d) for ln in lines)
+        if not counts: break
+        k, hits = counts.most_common(1)[0]
+        if k > 0 and hits >= 0.9 * len(lines): delim = d; break
+    return delim
+
+def _chunk_bounds(path: str, chunk_bytes: int) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path); bounds: List[Tuple[int, int]] = []; start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size: f.readline()   # fino al prossimo "\n"
+            end = f.tell(); bounds.append((start, end)); start = end
+    return bounds
+
+def _records(text: str, delimiter: str):
+    if '"' in text: return csv.reader(io.StringIO(text, newline=""), delimiter=delimiter)
+    lines = text.replace("\r\n", "\n").split("\n")
+    if lines and lines[-1] == "": lines.pop()
+    return (ln.split(delimiter) for ln in lines)
+
+def _cell(v: str) -> float:
+    v = v.strip()
+    if not v: return math.nan
+    try: return float(v.replace(",", "."))
+    except ValueError: return math.nan
+
+def _parse_chunk(args) -> Tuple[int, List[bytes], bytes, Dict[int, str], Dict[int, List[str]]]:
+    """Blocco [start, end) -> (righe, 6 colonne float64, stato, errori, testi grezzi delle righe in errore)."""
+    path, start, end, delimiter, first = args
+    with open(path, "rb") as f:
+        f.seek(start); text = f.read(end - start).decode("utf-8-sig" if first else "utf-8")
+    cols = [array("d") for _ in FIELDS]; state = array("d")
+    Dc, Sc, Hc, Lc, SGc, Cc = cols
+    errors: Dict[int, str] = {}; texts: Dict[int, List[str]] = {}
+    nan = math.nan; inf = math.inf; n = 0
+    for r in _records(text, delimiter):
+        if first and n == 0 and r and any(h.strip().lower() in HEADER_NAMES for h in r):
+            first = False; continue
+        if len(r) != 6: r = (list(r) + list(_PAD))[:6]
+        # Percorso veloce: solo righe certamente valide. NaN è il segnaposto della cella vuota,
+        # quindi un "nan" scritto (o inf) non passa mai di qui ma da parse_row
+        try:
+            d = float(r[0].replace(",", ".")); s = float(r[1].replace(",", ".")); h = float(r[2].replace(",", "."))
+            x = r[3]; l = float(x.replace(",", ".")) if x.strip() else None
+            x = r[4]; sg = float(x.replace(",", ".")) if x.strip() else None
+            x = r[5]; c = float(x.replace(",", ".")) if x.strip() else None
+            ok = (0 < d < inf and 0 < s < inf and 0 < h < inf and (l is None or 0 <= l < inf)
+                  and (sg is None or 0 <= sg < inf) and (c is None or 0.5 < c < 0.9999))
+        except ValueError:
+            ok = False
+        if ok:
+            Dc.append(d); Sc.append(s); Hc.append(h); Lc.append(nan if l is None else l)
+            SGc.append(nan if sg is None else sg); Cc.append(nan if c is None else c); state.append(_ST_OK)
+        else:
+            # Righe vuote o non valide: esito e messaggio identici al calcolo riga per riga
+            vals = [_cell(v) for v in r]
+            for col, v in zip(cols, vals): col.append(v)
+            if not any(v.strip() for v in r): state.append(_ST_DIRTY); n += 1; continue
+            try:
+                parse_row(r); state.append(_ST_OK)
+            except Exception as ex:
+                errors[n] = str(ex); state.append(_ST_ERR)
+            if any(v != v and t.strip() for v, t in zip(vals, r)): texts[n] = [t.strip() for t in r]
+        n += 1
+    return n, [c.tobytes() for c in cols], state.tobytes(), errors, texts
+
+def ingest_csv(path: str, delimiter: Optional[str] = None, workers: Optional[int] = None,
+               chunk_bytes: int = INGEST_CHUNK_BYTES) -> Tuple[RowModel, Dict[str, object]]:
+    """Importa un CSV D;S;H;L;sigma;csl in un RowModel a colonne con risultati già calcolati.
+
+    `delimiter` None = rilevato; `workers` None = tutti i core se il file supera
+    INGEST_PARALLEL_MIN_BYTES, 1 = nello stesso processo. Le righe restano allineate al file
+    (intestazione esclusa); gli errori sono in `model.errors` come nel calcolo da editor.
+    """
+    t0 = time.perf_counter()
+    with open(path, "rb") as f: sample = f.read(SNIFF_BYTES).decode("utf-8-sig", errors="ignore")
+    delim = sniff_csv(sample)
+    if delimiter: delim = delimiter
+    bounds = _chunk_bounds(path, chunk_bytes)
+    jobs = [(path, a, b, delim, i == 0) for i, (a, b) in enumerate(bounds)]
+    if workers is None: workers = (os.cpu_count() or 1) if bounds and bounds[-1][1] >= INGEST_PARALLEL_MIN_BYTES else 1
+    if workers <= 1 or len(jobs) <= 1:
+        parts = [_parse_chunk(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(min(workers, len(jobs)), mp_context=multiprocessing.get_context("spawn")) as ex:
+            parts = list(ex.map(_parse_chunk, jobs))
+    # Unione: colonne concatenate, indici riga spostati dell'offset del blocco
+    cols = [array("d") for _ in FIELDS]; state = array("d")
+    errors: Dict[int, str] = {}; texts: Dict[int, List[str]] = {}; off = 0
+    for n, pc, ps, pe, pt in parts:
+        for c, b in zip(cols, pc): c.frombytes(b)
+        state.frombytes(ps)
+        errors.update((off + i, m) for i, m in pe.items()); texts.update((off + i, t) for i, t in pt.items())
+        off += n
+    del parts
+    res = _results(cols, state, errors)
+    model = _columnar_model(cols, state, res, texts, errors)
+    dt = time.perf_counter() - t0
+    return model, {"rows": off, "valid": state.count(_ST_OK), "errors": len(errors), "delimiter": delim,
+                   "chunks": len(jobs), "seconds": dt, "rows_per_sec": off / dt if dt > 0 else 0.0}
+
+def _results(cols: Sequence[array], state: array, errors: Dict[int, str]) -> List[Sequence[float]]:
+    # Un'unica chiamata a eoq_batch sulle colonne intere; le righe non valide escono NaN
+    if not len(state): return []
+    if HAS_NP:
+        np = _load_np()
+        res = eoq_batch(*(np.frombuffer(c, dtype=np.float64) for c in cols))
+        ok = res["ok"]; st = np.frombuffer(state, dtype=np.float64)
+        for i in np.flatnonzero((st == _ST_OK) & ~ok).tolist(): errors[i] = NONFINITE_MSG; state[i] = _ST_ERR
+        return [memoryview(np.ascontiguousarray(res[k])) for k in BATCH_COLS]
+    res = eoq_batch(*cols, use_numpy=False)
+    for i, (s, ok) in enumerate(zip(state, res["ok"])):
+        if s == _ST_OK and not ok: errors[i] = NONFINITE_MSG; state[i] = _ST_ERR
+    return [array("d", res[k]) for k in BATCH_COLS]
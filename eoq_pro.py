@@ -3,64 +3,114 @@
 EOQ Pro - Versione Semplice (senza ABC)
 ---------------------------------------
 - EOQ, costi, ROP, Scorta di Sicurezza
-- Import/Export CSV, Salva/Apri progetto JSON
-- Report HTML (sempre) + PDF (se 'reportlab' presente)
+- Import/Export CSV, Salva/Apri progetto (binario .eoqp o JSON)
+- Report HTML in streaming, anche paginato (sempre) + PDF (se 'reportlab' presente)
+- Sconti quantità (tutte le unità / incrementali) da listino prezzi CSV
 - Grafico costi vs Q (se 'matplotlib' presente)
+- Simulazione Monte Carlo di ROP/scorta di sicurezza (se 'numpy' presente)
+- Motore batch vettoriale + modalità CLI headless (vedi eoq_core)
 - Branding base (nome, colore, logo PNG/SVG)
 """
-import csv, json, math, os
+import time
+_T_START = time.perf_counter()
+import csv, io, json, math, os, sys
+from bisect import bisect_left
 from datetime import datetime
-from typing import Tuple, Dict
+from importlib.util import find_spec
+from typing import Dict
+
+def _cli(argv):
+    # Comandi headless: nessun import di tkinter/matplotlib/reportlab
+    if argv[0] == "batch":
+        from eoq_core import cli_batch; return cli_batch(argv[1:])
+    from eoq_sim import cli_simulate; return cli_simulate(argv[1:])
+CLI_COMMANDS = ("batch", "simulate")
+
+if __name__ == "__main__" and sys.argv[1:2] and sys.argv[1] in CLI_COMMANDS:
+    if sys.argv[1] == "simulate":
+        import multiprocessing; multiprocessing.freeze_support()
+    sys.exit(_cli(sys.argv[1:]))
+
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-
-try:
-    import matplotlib.pyplot as plt  # type: ignore
-    HAS_MPL = True
-except Exception:
-    HAS_MPL = False
-
-try:
-    from reportlab.lib.pagesizes import A4  # type: ignore
-    from reportlab.pdfgen import canvas as pdfcanvas  # type: ignore
-    from reportlab.lib.units import cm  # type: ignore
-    HAS_PDF = True
-except Exception:
-    HAS_PDF = False
-
-Z_BY_CSL = {0.80: 0.8416, 0.90: 1.2816, 0.95: 1.6449, 0.975: 1.9600, 0.99: 2.3263, 0.995: 2.5758}
-
-def parse_number(value: str, allow_zero: bool = False) -> float:
-    s = (value or "").strip().replace(",", ".")
-    if s == "": raise ValueError("vuoto")
-    x = float(s)
-    if allow_zero:
-        if x < 0: raise ValueError("<0")
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from eoq_core import (FIELDS, RESULT_HEADER, parse_number, format_result, RowModel, HAS_NP,
+                      save_project_bin, open_project_bin, read_tiers_csv, PLAN_BLOCKED_MSG)
+from eoq_core import Z_BY_CSL, eoq_only, rop_and_safety
+# API pubblica: GUI più le funzioni di calcolo storicamente definite qui, ora riesportate da eoq_core
+__all__ = ["EOQProSimple", "main", "Z_BY_CSL", "parse_number", "eoq_only", "rop_and_safety"]
+from eoq_sens import SENS_HEADER, SENS_PARAMS, SENS_LABELS, SENS_PCT, cost_curve, tier_curve, sensitivity, tornado_rows
+from eoq_report import (HTML_PAGE_ROWS, PDF_PARALLEL_MIN_ROWS, write_html_report, write_html_report_paged,
+                        write_pdf_report)
+
+# Dipendenze opzionali: solo verifica di presenza (economica); l'import avviene al primo grafico/PDF
+HAS_MPL = find_spec("matplotlib") is not None
+HAS_PDF = find_spec("reportlab") is not None
+plt = None
+
+def _pyplot():
+    global plt
+    if plt is None:
+        import matplotlib.pyplot as pyplot  # type: ignore
+        plt = pyplot
+    return plt
+
+# Tempi di avvio: --startup-timing (stderr) oppure EOQ_STARTUP_TIMING=1|percorso.jsonl
+STARTUP_TIMING = os.environ.get("EOQ_STARTUP_TIMING", "")
+if "--startup-timing" in sys.argv[1:]: STARTUP_TIMING = STARTUP_TIMING or "1"
+_STARTUP_MARKS = [("import", time.perf_counter())]
+
+def _mark(phase: str):
+    if STARTUP_TIMING: _STARTUP_MARKS.append((phase, time.perf_counter()))
+
+def _report_startup():
+    prev = _T_START; phases = {}
+    for name, t in _STARTUP_MARKS:
+        phases[name] = round((t - prev) * 1000, 1); prev = t
+    total = round((prev - _T_START) * 1000, 1)
+    if STARTUP_TIMING == "1":
+        print("Avvio (ms): " + "  ".join(f"{k}={v}" for k, v in phases.items()) + f"  totale={total}", file=sys.stderr)
     else:
-        if x <= 0: raise ValueError("<=0")
-    return x
-
-def eoq_only(D: float, S: float, H: float) -> Tuple[float, float, float, float]:
-    Q = math.sqrt((2.0 * D * S) / H)
-    cost_order = (D / Q) * S
-    cost_hold = (Q / 2.0) * H
-    return Q, cost_order, cost_hold, cost_order + cost_hold
-
-def rop_and_safety(D: float, L_days: float, sigma_d: float = 0.0, csl: float = 0.95) -> Tuple[float, float]:
-    mu_d = D / 365.0
-    z = Z_BY_CSL.get(round(csl, 3), Z_BY_CSL[0.95])
-    ss = (z * sigma_d * math.sqrt(max(L_days, 0.0))) if sigma_d > 0 and L_days > 0 else 0.0
-    rop = mu_d * max(L_days, 0.0) + ss
-    return rop, ss
+        with open(STARTUP_TIMING, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"at": datetime.now().isoformat(), "phases_ms": phases, "total_ms": total,
+                                "frozen": bool(getattr(sys, "frozen", False))}) + "\n")
+
+def _fractions(top: int, page: int, n: int):
+    return (0.0, 1.0) if n <= 0 else (top / n, min(1.0, (top + page) / n))
+
+def _scroll_target(top: int, page: int, n: int, args) -> int:
+    # Comandi scrollbar Tk: ("moveto", frac) | ("scroll", n, "units"/"pages")
+    if args[0] == "moveto": top = int(float(args[1]) * n)
+    elif args[0] == "scroll": top += int(args[1]) * (page if args[2] == "pages" else 1)
+    return max(0, min(top, n - page))
+
+def _wheel_units(event) -> int:
+    if getattr(event, "num", None) == 4: return -1
+    if getattr(event, "num", None) == 5: return 1
+    return -1 if event.delta > 0 else 1
+
+EDITOR_ROWS = 8      # righe di widget nell'editor (le altre restano solo nel modello)
+DEFAULT_ROWS = 3
+ROW_HEIGHT = 22      # altezza riga Treeview, per calcolare quante righe sono visibili
+MAX_ERRORS_SHOWN = 30
+SENS_REPORT_MAX_ROWS = 5000   # oltre, la tabella di sensibilità (5 righe per articolo) non va nei report
 
 class EOQProSimple(tk.Tk):
     def __init__(self):
-        super().__init__()
+        super().__init__(); _mark("tk")
         self.title("EOQ Pro - Semplice")
         self.geometry("1100x650"); self.minsize(980, 600)
         self.brand: Dict[str, str] = {"name": "EOQ Pro", "color": "#0F6FFF", "logo_path": ""}
-        self.entries = []
-        self._style(); self._ui()
+        self.model = RowModel(DEFAULT_ROWS)
+        self._slots = []; self._top = 0; self._loading = False; self._recalc_job = None
+        self._res_index = []; self._res_top = 0; self._res_page = 20
+        self._sens_pct = SENS_PCT
+        self._style(); _mark("style")
+        self._ui(); _mark("ui")
+        if STARTUP_TIMING: self.bind("<Map>", self._first_map, add="+")
+
+    def _first_map(self, event):
+        if event.widget is not self: return
+        self.unbind("<Map>"); self.after_idle(lambda: (_mark("first_window"), _report_startup()))
 
     def _style(self):
         style = ttk.Style(self)
@@ -70,6 +120,7 @@ class EOQProSimple(tk.Tk):
         style.configure("Header.TLabel", font=("Arial", 14, "bold"))
         style.configure("Bold.TLabel", font=("Arial", 10, "bold"))
         style.configure("Treeview.Heading", font=("Arial", 10, "bold"))
+        style.configure("Treeview", rowheight=ROW_HEIGHT)
         style.configure("TButton", padding=6)
 
     def _ui(self):
@@ -81,6 +132,7 @@ class EOQProSimple(tk.Tk):
         filemenu.add_command(label="Salva progetto", command=self._save)
         filemenu.add_separator()
         filemenu.add_command(label="Importa CSV…", command=self._import_csv)
+        filemenu.add_command(label="Importa listino prezzi CSV…", command=self._import_tiers)
         filemenu.add_command(label="Esporta CSV…", command=self._export_csv)
         filemenu.add_separator()
         filemenu.add_command(label="Report HTML…", command=self._export_html)
@@ -89,6 +141,9 @@ class EOQProSimple(tk.Tk):
 
         toolsmenu = tk.Menu(menubar, tearoff=0)
         toolsmenu.add_command(label="Grafico costi vs Q", command=self._plot_cost_curve)
+        toolsmenu.add_command(label="Analisi di sensibilità (tornado)…", command=self._sensitivity)
+        toolsmenu.add_command(label="Simulazione Monte Carlo (ROP/SS)…", command=self._simulate)
+        toolsmenu.add_command(label="Pianificazione multi-periodo (lotti)…", command=self._plan)
         menubar.add_cascade(label="Strumenti", menu=toolsmenu)
 
         brandmenu = tk.Menu(menubar, tearoff=0)
@@ -103,13 +158,17 @@ class EOQProSimple(tk.Tk):
 
         ttk.Label(self, text="Inserisci i dati (una riga per anno/periodo)", style="Header.TLabel").pack(anchor="w", padx=12, pady=(10, 6))
 
-        # Editor
-        frame = ttk.Frame(self); frame.pack(fill="x", padx=12, pady=(0,8))
+        # Editor (virtualizzato: EDITOR_ROWS righe di widget riusate scorrendo il modello)
+        outer = ttk.Frame(self); outer.pack(fill="x", padx=12, pady=(0,8))
+        frame = ttk.Frame(outer); frame.pack(side="left", fill="x", expand=True)
         labels = ["Anno","Domanda annua (D)","Costo setup (S)","Costo mantenimento (H)","Lead time L (giorni)","σ domanda giornaliera","Livello servizio (es. 0.95)"]
         for c, text in enumerate(labels):
             ttk.Label(frame, text=text, style="Bold.TLabel").grid(row=0, column=c, sticky="w", padx=6, pady=4)
-        self.entries_frame = frame; self._rows = 0
-        for _ in range(3): self._add_row()
+        self.entries_frame = frame
+        self.editor_scroll = ttk.Scrollbar(outer, orient="vertical", command=self._editor_yview)
+        self.editor_scroll.pack(side="right", fill="y")
+        for _ in range(EDITOR_ROWS): self._add_slot()
+        self._bind_wheel(frame, self._editor_wheel)
 
         btns = ttk.Frame(self); btns.pack(fill="x", padx=12, pady=6)
         ttk.Button(btns, text="Aggiungi riga", command=self._add_row).pack(side="left", padx=4)
@@ -119,252 +178,396 @@ class EOQProSimple(tk.Tk):
         # Risultati
         res = ttk.LabelFrame(self, text="Risultati"); res.pack(fill="both", expand=True, padx=12, pady=(4,12))
         cols = ("Riga","D","S","H","L","σ","CSL","EOQ","Ord","Hold","Totale","ROP","Safety Stock")
+        # Treeview virtualizzata: contiene solo le righe visibili, lo scroll sposta la finestra sul modello
         self.tree = ttk.Treeview(res, columns=cols, show="headings")
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, width=90, anchor="center", stretch=True)
-        yscroll = ttk.Scrollbar(res, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=yscroll.set); self.tree.pack(side="left", fill="both", expand=True)
-        yscroll.pack(side="right", fill="y")
+        self.res_scroll = ttk.Scrollbar(res, orient="vertical", command=self._results_yview)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.res_scroll.pack(side="right", fill="y")
+        self.tree.bind("<Configure>", self._results_resize)
+        self._bind_wheel(self.tree, self._results_wheel)
 
         self.status = ttk.Label(self, text="Pronto. Default CSL=0.95 (se vuoto).", foreground="#555")
         self.status.pack(anchor="w", padx=12, pady=(0,8))
+        self._refresh_editor()
+
+    def _add_slot(self):
+        r = len(self._slots) + 1
+        slot = {"label": ttk.Label(self.entries_frame, text=f"{r}"), "widgets": [], "vars": {}}
+        slot["label"].grid(row=r, column=0, padx=6, pady=4, sticky="w")
+        for c, (k, width) in enumerate(zip(FIELDS, (12, 12, 12, 10, 10, 12)), start=1):
+            var = tk.StringVar(self)
+            e = ttk.Entry(self.entries_frame, width=width, textvariable=var)
+            e.grid(row=r, column=c, padx=6, pady=4, sticky="ew")
+            var.trace_add("write", lambda *_, s=r-1, k=k: self._on_edit(s, k))
+            self._bind_wheel(e, self._editor_wheel)
+            slot["widgets"].append(e); slot["vars"][k] = var
+        self._slots.append(slot)
 
     def _add_row(self):
-        r = self._rows + 1
-        e_anno = ttk.Label(self.entries_frame, text=f"{r}")
-        eD = ttk.Entry(self.entries_frame, width=12)
-        eS = ttk.Entry(self.entries_frame, width=12)
-        eH = ttk.Entry(self.entries_frame, width=12)
-        eL = ttk.Entry(self.entries_frame, width=10)
-        eSig = ttk.Entry(self.entries_frame, width=10)
-        eCSL = ttk.Entry(self.entries_frame, width=12)
-        e_anno.grid(row=r, column=0, padx=6, pady=4, sticky="w")
-        eD.grid(row=r, column=1, padx=6, pady=4, sticky="ew")
-        eS.grid(row=r, column=2, padx=6, pady=4, sticky="ew")
-        eH.grid(row=r, column=3, padx=6, pady=4, sticky="ew")
-        eL.grid(row=r, column=4, padx=6, pady=4, sticky="ew")
-        eSig.grid(row=r, column=5, padx=6, pady=4, sticky="ew")
-        eCSL.grid(row=r, column=6, padx=6, pady=4, sticky="ew")
-        self.entries.append({"D":eD,"S":eS,"H":eH,"L":eL,"sigma":eSig,"csl":eCSL}); self._rows += 1
+        self.model.append()
+        self._top = max(0, len(self.model) - EDITOR_ROWS); self._refresh_editor()
+
+    # Vista virtuale: editor
+    def _refresh_editor(self):
+        n = len(self.model); self._top = max(0, min(self._top, n - EDITOR_ROWS))
+        self._loading = True
+        try:
+            for s, slot in enumerate(self._slots):
+                i = self._top + s
+                if i < n:
+                    slot["label"].config(text=f"{i+1}"); slot["label"].grid()
+                    for w in slot["widgets"]: w.grid()
+                    for k in FIELDS: slot["vars"][k].set(self.model.cols[k][i])
+                else:
+                    slot["label"].grid_remove()
+                    for w in slot["widgets"]: w.grid_remove()
+        finally:
+            self._loading = False
+        self.editor_scroll.set(*_fractions(self._top, EDITOR_ROWS, n))
+
+    def _editor_yview(self, *args):
+        self._top = _scroll_target(self._top, EDITOR_ROWS, len(self.model), args); self._refresh_editor()
+    def _editor_wheel(self, event):
+        self._top += _wheel_units(event); self._refresh_editor(); return "break"
+
+    def _on_edit(self, slot: int, key: str):
+        if self._loading: return
+        i = self._top + slot
+        if i < len(self.model) and self.model.set(i, key, self._slots[slot]["vars"][key].get()):
+            if self._recalc_job: self.after_cancel(self._recalc_job)
+            self._recalc_job = self.after(250, self._recalc_dirty)
+
+    def _recalc_dirty(self):
+        # Ricalcolo incrementale: solo le righe modificate, ridisegnando solo quelle
+        self._recalc_job = None
+        changed = self.model.recompute(); self._update_results(changed)
+        err = next((f"Riga {i+1}: {self.model.errors[i]}" for i in changed if i in self.model.errors), "")
+        self.status.config(text=err or f"Aggiornato. Righe valide: {len(self._res_index)}.")
+
+    # Vista virtuale: risultati
+    def _update_results(self, changed):
+        idx = self._res_index; results = self.model.results
+        if len(changed) > 64:
+            self._res_index = self.model.result_indices()
+            self._refresh_results(); return
+        moved = False
+        for i in changed:
+            pos = bisect_left(idx, i); present = pos < len(idx) and idx[pos] == i
+            if results[i] is not None and not present: idx.insert(pos, i); moved = True
+            elif results[i] is None and present: del idx[pos]; moved = True
+        if moved: self._refresh_results(); return
+        for i in changed:
+            s = bisect_left(idx, i) - self._res_top
+            if results[i] is not None and 0 <= s < self._res_page and self.tree.exists(f"v{s}"):
+                self.tree.item(f"v{s}", values=format_result(results[i]))
+
+    def _refresh_results(self):
+        n = len(self._res_index); page = self._res_page
+        self._res_top = max(0, min(self._res_top, n - page))
+        items = self.tree.get_children(); want = min(page, n - self._res_top)
+        for iid in items[want:]: self.tree.delete(iid)
+        for s in range(want):
+            vals = format_result(self.model.results[self._res_index[self._res_top + s]])
+            if s < len(items): self.tree.item(items[s], values=vals)
+            else: self.tree.insert("", "end", iid=f"v{s}", values=vals)
+        self.res_scroll.set(*_fractions(self._res_top, page, n))
+
+    def _results_resize(self, event):
+        page = max(1, (event.height - ROW_HEIGHT - 6) // ROW_HEIGHT)
+        if page != self._res_page: self._res_page = page; self._refresh_results()
+    def _results_yview(self, *args):
+        self._res_top = _scroll_target(self._res_top, self._res_page, len(self._res_index), args); self._refresh_results()
+    def _results_wheel(self, event):
+        self._res_top += 3 * _wheel_units(event); self._refresh_results(); return "break"
+
+    def _bind_wheel(self, widget, handler):
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): widget.bind(seq, handler)
+
+    def _after_load(self):
+        if self._recalc_job: self.after_cancel(self._recalc_job); self._recalc_job = None
+        while len(self.model) < DEFAULT_ROWS: self.model.append()
+        self._top = 0; self._res_top = 0; self._res_index = self.model.result_indices()
+        self._refresh_editor(); self._refresh_results()
 
     # File ops
     def _new(self):
         if not self._confirm(): return
         self._clear()
     def _open(self):
-        p = filedialog.askopenfilename(filetypes=[("EOQ Project","*.json")], title="Apri progetto")
+        p = filedialog.askopenfilename(filetypes=[("EOQ Project","*.eoqp *.json"),("EOQ Project (binario)","*.eoqp"),("EOQ Project (JSON)","*.json")], title="Apri progetto")
         if not p: return
         try:
-            with open(p,"r",encoding="utf-8") as f: data=json.load(f)
-            self._clear()
-            rows = data.get("rows", [])
-            for i, row in enumerate(rows):
-                if i >= self._rows: self._add_row()
-                self.entries[i]["D"].insert(0, str(row.get("D","")))
-                self.entries[i]["S"].insert(0, str(row.get("S","")))
-                self.entries[i]["H"].insert(0, str(row.get("H","")))
-                self.entries[i]["L"].insert(0, str(row.get("L","")))
-                self.entries[i]["sigma"].insert(0, str(row.get("sigma","")))
-                self.entries[i]["csl"].insert(0, str(row.get("csl","")))
+            if p.lower().endswith(".json"):
+                with open(p,"r",encoding="utf-8") as f: data=json.load(f)
+                self.model.load([str(row.get(k,"")) for k in FIELDS] for row in data.get("rows", []))
+                self.model.load_options_meta(data)
+            else:
+                # Binario: colonne in memory-map, risultati in cache già pronti (niente ricalcolo)
+                self.model, data = open_project_bin(p)
+            self._after_load()
+            if self._res_index: self.status.config(text=f"Risultati in cache: {len(self._res_index)} righe.")
             brand = data.get("brand"); 
             if brand: self.brand.update(brand)
             messagebox.showinfo("Progetto", f"Caricato: {os.path.basename(p)}")
         except Exception as ex:
             messagebox.showerror("Errore apertura", str(ex))
     def _save(self):
-        rows = [{"D":w["D"].get().strip(),"S":w["S"].get().strip(),"H":w["H"].get().strip(),
-                 "L":w["L"].get().strip(),"sigma":w["sigma"].get().strip(),"csl":w["csl"].get().strip()} for w in self.entries]
-        p = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("EOQ Project","*.json")], title="Salva progetto")
+        p = filedialog.asksaveasfilename(defaultextension=".eoqp", filetypes=[("EOQ Project (binario)","*.eoqp"),("EOQ Project (JSON)","*.json")], title="Salva progetto")
         if not p: return
         try:
-            with open(p,"w",encoding="utf-8") as f:
-                json.dump({"rows":rows,"brand":self.brand,"saved_at":datetime.now().isoformat()}, f, ensure_ascii=False, indent=2)
+            meta = {"brand":self.brand,"saved_at":datetime.now().isoformat()}
+            if p.lower().endswith(".json"):
+                rows = [{k: v.strip() for k, v in zip(FIELDS, self.model.row(i))} for i in range(len(self.model))]
+                with open(p,"w",encoding="utf-8") as f:
+                    json.dump(dict(rows=rows, **meta, **self.model.options_meta()), f, ensure_ascii=False, indent=2)
+            else:
+                if self.model.source and os.path.abspath(self.model.source) == os.path.abspath(p): self.model.materialize()
+                save_project_bin(p, self.model, meta)
             messagebox.showinfo("Progetto", f"Salvato in:\n{p}")
         except Exception as ex:
             messagebox.showerror("Errore salvataggio", str(ex))
 
     def _import_csv(self):
-        p = filedialog.askopenfilename(filetypes=[("CSV","*.csv")], title="Importa CSV (D;S;H;L;sigma;csl)")
+        p = filedialog.askopenfilename(filetypes=[("CSV","*.csv *.txt")], title="Importa CSV (D;S;H;L;sigma;csl)")
         if not p: return
         try:
-            with open(p,"r",encoding="utf-8") as f: rows=list(csv.reader(f, delimiter=";"))
-            header = rows[0] if rows else []
-            start = 1 if header and any(h.lower() in ("d","domanda","s","h","l","sigma","csl") for h in header) else 0
-            rows = rows[start:]
-            if not rows: messagebox.showwarning("Import","Nessun dato."); return
-            self._clear()
-            for i, r in enumerate(rows):
-                if i >= self._rows: self._add_row()
-                vals = (r + ["","","","",""])[:6]
-                self.entries[i]["D"].insert(0, vals[0])
-                self.entries[i]["S"].insert(0, vals[1])
-                self.entries[i]["H"].insert(0, vals[2])
-                self.entries[i]["L"].insert(0, vals[3])
-                self.entries[i]["sigma"].insert(0, vals[4])
-                self.entries[i]["csl"].insert(0, vals[5])
-            messagebox.showinfo("Import", f"Importate {len(rows)} righe.")
+            # Import a blocchi in parallelo: colonne float e risultati già calcolati, errori raccolti in blocco
+            from eoq_ingest import ingest_csv   # multiprocessing solo al primo import, non all'avvio
+            self.status.config(text="Import in corso…"); self.update_idletasks()
+            model, st = ingest_csv(p)
+            if not len(model): messagebox.showwarning("Import","Nessun dato."); return
+            n = len(model); self.model = model; self._after_load()
+            sep = {"\t": "tab"}.get(st["delimiter"], st["delimiter"])
+            self.status.config(text=f"Importate {n} righe (separatore '{sep}'): "
+                                    f"{st['valid']} calcolate, {st['errors']} con errori, {st['seconds']:.1f}s.")
+            msg = f"Importate {n} righe."
+            if model.errors:
+                errs = [f"Riga {i+1}: {m}" for i, m in sorted(model.errors.items())[:MAX_ERRORS_SHOWN]]
+                more = f"\n… e altri {len(model.errors) - MAX_ERRORS_SHOWN} errori" if len(model.errors) > MAX_ERRORS_SHOWN else ""
+                msg += f"\n\nRighe non valide: {len(model.errors)}\n" + "\n".join(errs) + more
+            messagebox.showinfo("Import", msg)
         except Exception as ex:
             messagebox.showerror("Errore import", str(ex))
 
+    def _import_tiers(self):
+        p = filedialog.askopenfilename(filetypes=[("CSV","*.csv")], title="Importa listino prezzi (riga;qta_min;prezzo)")
+        if not p: return
+        try:
+            with open(p,"r",encoding="utf-8") as f: tiers = read_tiers_csv(f)
+            if not tiers: messagebox.showwarning("Listino","Nessun dato."); return
+            incr = messagebox.askyesno("Listino", "Sconti incrementali (prezzo solo sulle unità oltre la soglia)?\nNo = sconto su tutte le unità.")
+            rate = simpledialog.askfloat("Listino", "Tasso di mantenimento i sul prezzo (es. 0.2).\nMantenimento = H + i × prezzo",
+                                         initialvalue=self.model.holding_rate or 0.2, minvalue=0.0, parent=self)
+            if rate is None: return
+            self.model.set_tiers(tiers, "incremental" if incr else "all", rate)
+            self._calc()
+        except Exception as ex:
+            messagebox.showerror("Errore listino", str(ex))
+
     def _export_csv(self):
-        if not self.tree.get_children():
+        if not self._res_index:
             messagebox.showwarning("Esporta CSV", "Calcola prima i risultati."); return
         p = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")], title="Esporta risultati CSV")
         if not p: return
         try:
             with open(p,"w",newline="",encoding="utf-8") as f:
                 w = csv.writer(f, delimiter=";")
-                w.writerow(["Riga","D","S","H","L","sigma","CSL","EOQ","Costo_ordinazione","Costo_mantenimento","Costo_totale","ROP","Safety_Stock"])
-                for item in self.tree.get_children():
-                    w.writerow(self.tree.item(item,"values"))
+                w.writerow(RESULT_HEADER)
+                w.writerows(format_result(r) for r in self.model.result_rows())
             messagebox.showinfo("Esporta CSV", f"Esportato in:\n{p}")
         except Exception as ex:
             messagebox.showerror("Errore export", str(ex))
 
     # Calcolo
     def _calc(self):
-        for item in self.tree.get_children(): self.tree.delete(item)
-        errors, computed = [], []
-        for idx, w in enumerate(self.entries, start=1):
-            raw = {k:w[k].get().strip() for k in ("D","S","H","L","sigma","csl")}
-            if not any(raw.values()): continue
-            try:
-                D = parse_number(raw["D"]); S = parse_number(raw["S"]); H = parse_number(raw["H"])
-                L = parse_number(raw["L"], allow_zero=True) if raw["L"] else 0.0
-                sigma = parse_number(raw["sigma"], allow_zero=True) if raw["sigma"] else 0.0
-                csl = float(raw["csl"].replace(",", ".")) if raw["csl"] else 0.95
-                if not (0.5 < csl < 0.9999): raise ValueError("CSL fuori range (0.5–0.999)")
-                Q, c_ord, c_hold, c_tot = eoq_only(D,S,H)
-                rop, ss = rop_and_safety(D,L,sigma,csl)
-                computed.append((idx,D,S,H,L,sigma,csl,Q,c_ord,c_hold,c_tot,rop,ss))
-            except Exception as ex:
-                errors.append(f"Riga {idx}: {ex}")
-        if errors: messagebox.showerror("Errori di input", "\n".join(errors))
-        for row in computed:
-            vals = [row[0], f"{row[1]:.2f}", f"{row[2]:.2f}", f"{row[3]:.2f}", f"{row[4]:.2f}", f"{row[5]:.2f}",
-                    f"{row[6]:.3f}", f"{row[7]:.2f}", f"{row[8]:.2f}", f"{row[9]:.2f}", f"{row[10]:.2f}",
-                    f"{row[11]:.2f}", f"{row[12]:.2f}"]
-            self.tree.insert("", "end", values=vals)
-        self.status.config(text=f"Calcolo completato. Righe valide: {len(computed)}.")
+        changed = self.model.recompute()
+        self._update_results(changed)
+        errors = [f"Riga {i+1}: {m}" for i, m in sorted(self.model.errors.items()) if m != PLAN_BLOCKED_MSG]
+        blocked = len(self.model.errors) - len(errors)
+        if errors:
+            more = f"\n… e altri {len(errors) - MAX_ERRORS_SHOWN} errori" if len(errors) > MAX_ERRORS_SHOWN else ""
+            head = (f"Pianificazione multi-periodo sospesa ({blocked} righe senza piano):\n"
+                    "correggi o svuota le righe in errore.\n\n") if blocked else ""
+            messagebox.showerror("Errori di input", head + "\n".join(errors[:MAX_ERRORS_SHOWN]) + more)
+        self.status.config(text=f"Calcolo completato. Righe valide: {len(self._res_index)}.")
 
     # Report
     def _export_html(self):
-        if not self.tree.get_children(): messagebox.showwarning("Report","Calcola prima i risultati."); return
+        if not self._res_index: messagebox.showwarning("Report","Calcola prima i risultati."); return
         p = filedialog.asksaveasfilename(defaultextension=".html", filetypes=[("HTML","*.html")], title="Esporta report HTML")
         if not p: return
         try:
-            rows = [self.tree.item(i,"values") for i in self.tree.get_children()]
+            rows = (format_result(r) for r in self.model.result_rows())
             now = datetime.now().strftime("%Y-%m-%d %H:%M")
-            html = self._build_html(rows, now)
-            with open(p,"w",encoding="utf-8") as f: f.write(html)
+            n = len(self._res_index)
+            sens = self._report_sensitivity()
+            if n > HTML_PAGE_ROWS and messagebox.askyesno("Report", f"{n} righe: dividere il report in pagine HTML collegate da {HTML_PAGE_ROWS} righe?"):
+                paths = write_html_report_paged(p, rows, self.brand, now, sensitivity=sens)
+                messagebox.showinfo("Report", f"Report salvato in {len(paths)} pagine:\n{p}"); return
+            with open(p,"w",encoding="utf-8") as f: write_html_report(f, rows, self.brand, now, sensitivity=sens)
             messagebox.showinfo("Report", f"Report salvato in:\n{p}")
         except Exception as ex:
             messagebox.showerror("Errore report", str(ex))
 
     def _build_html(self, rows, timestamp: str) -> str:
-        logo_html = ""
-        if self.brand.get("logo_path") and os.path.exists(self.brand["logo_path"]):
-            try:
-                import base64
-                with open(self.brand["logo_path"],"rb") as imgf:
-                    b64 = base64.b64encode(imgf.read()).decode("ascii")
-                ext = "png" if self.brand["logo_path"].lower().endswith(".png") else "svg+xml"
-                logo_html = f'<img alt="logo" style="height:48px;vertical-align:middle" src="data:image/{ext};base64,{b64}">'
-            except Exception: logo_html = ""
-        primary = self.brand.get("color","#0F6FFF"); name = self.brand.get("name","EOQ Pro")
-        head = f"""<!doctype html><html lang='it'><head><meta charset='utf-8'>
-<meta name='viewport' content='width=device-width, initial-scale=1'><title>Report EOQ - {name}</title>
-<style>
-:root {{ --primary: {primary}; }}
-body {{ font-family: Arial, sans-serif; margin: 24px; }}
-.header {{ display:flex; align-items:center; gap:12px; }}
-.brand {{ font-size: 22px; font-weight: 700; color: var(--primary); }}
-table {{ border-collapse: collapse; width: 100%; margin-top: 16px; }}
-th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
-th {{ background: #f4f4f4; }}
-.small {{ font-size: 12px; color:#666; }}
-.code {{ background:#f8f8f8; padding:8px; border:1px solid #eee; }}
-</style></head><body>"""
-        header = f"<div class='header'>{logo_html}<div class='brand'>{name}</div></div><div class='small'>Generato il {timestamp}</div>"
-        th = ["Riga","D","S","H","L","σ","CSL","EOQ","Costo Ord.","Costo Hold","Totale","ROP","Safety Stock"]
-        table = "<table><tr>" + "".join(f"<th>{h}</th>" for h in th) + "</tr>" + \
-                "\n".join("<tr>" + "".join(f"<td>{v}</td>" for v in row) + "</tr>" for row in rows) + "</table>"
-        formulas = """
-<h3>Formule</h3>
-<div class="code">
-EOQ = sqrt( 2 D S / H )<br>
-Costo Ordinazione = (D / EOQ) * S<br>
-Costo Mantenimento = (EOQ / 2) * H<br>
-Costo Totale = Costo Ordinazione + Costo Mantenimento<br>
-Domanda media giornaliera μ_d = D / 365<br>
-Scorta di Sicurezza = z * σ_d * sqrt(L)<br>
-ROP = μ_d * L + Scorta di Sicurezza
-</div>"""
-        return head + header + table + formulas + "</body></html>"
+        buf = io.StringIO(); write_html_report(buf, rows, self.brand, timestamp)
+        return buf.getvalue()
 
     def _export_pdf(self):
         if not HAS_PDF: messagebox.showwarning("Report PDF","Installa 'reportlab' (pip install reportlab)."); return
-        if not self.tree.get_children(): messagebox.showwarning("Report PDF","Calcola prima i risultati."); return
+        if not self._res_index: messagebox.showwarning("Report PDF","Calcola prima i risultati."); return
         p = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF","*.pdf")], title="Esporta report PDF")
         if not p: return
         try:
-            c = pdfcanvas.Canvas(p, pagesize=A4); width, height = A4; margin = 2 * cm; y = height - margin
-            c.setFont("Helvetica-Bold", 16)
-            def hex_to_rgb(h): h=h.lstrip("#"); return tuple(int(h[i:i+2],16)/255 for i in (0,2,4))
-            r,g,b = hex_to_rgb(self.brand.get("color","#0F6FFF")); c.setFillColorRGB(r,g,b)
-            c.drawString(margin, y, self.brand.get("name","EOQ Pro")); y -= 8; c.setFillColorRGB(0,0,0)
-            c.setFont("Helvetica", 9); c.drawString(margin, y, f"Report EOQ • {datetime.now().strftime('%Y-%m-%d %H:%M')}"); y -= 18
-            logo = self.brand.get("logo_path")
-            if logo and os.path.exists(logo) and logo.lower().endswith(".png"):
-                try: c.drawImage(logo, width - margin - 2.5*cm, height - margin - 2.5*cm, 2.5*cm, 2.5*cm, preserveAspectRatio=True, mask='auto')
-                except Exception: pass
-            headers = ["Riga","D","S","H","L","σ","CSL","EOQ","Ord","Hold","Totale","ROP","SS"]
-            data = [headers] + [list(map(str, self.tree.item(i,"values"))) for i in self.tree.get_children()]
-            colw = [1.1*cm,1.7*cm,1.7*cm,1.7*cm,1.4*cm,1.5*cm,1.5*cm,1.8*cm,1.8*cm,1.8*cm,1.8*cm,1.8*cm,1.8*cm]
-            x0 = margin; rowh = 0.66*cm
-            for r_i, row in enumerate(data):
-                x = x0
-                if y < margin + 5*rowh:
-                    c.showPage(); y = height - margin
-                    c.setFont("Helvetica-Bold", 16); c.setFillColorRGB(r,g,b)
-                    c.drawString(margin, y, self.brand.get("name","EOQ Pro")); y -= 18; c.setFillColorRGB(0,0,0); c.setFont("Helvetica", 9)
-                for i, cell in enumerate(row):
-                    c.setFont("Helvetica-Bold", 8) if r_i == 0 else c.setFont("Helvetica", 8)
-                    c.rect(x, y - rowh, colw[i], rowh, stroke=1, fill=0)
-                    c.drawString(x+2, y - rowh + 2, str(cell)[:18]); x += colw[i]
-                y -= rowh
-            c.save(); messagebox.showinfo("Report PDF", f"Report salvato in:\n{p}")
+            n = len(self._res_index)
+            workers = min(os.cpu_count() or 1, 4) if n >= PDF_PARALLEL_MIN_ROWS else 1
+            rows = (format_result(r) for r in self.model.result_rows())
+            pages = write_pdf_report(p, rows, self.brand, datetime.now().strftime('%Y-%m-%d %H:%M'), workers=workers,
+                                     sensitivity=self._report_sensitivity())
+            messagebox.showinfo("Report PDF", f"Report salvato in:\n{p} ({pages} pagine)")
         except Exception as ex:
             messagebox.showerror("Errore PDF", str(ex))
 
+    def _report_sensitivity(self):
+        # Modello EOQ base: niente sensibilità per il piano multi-periodo, righe con listino segnate n/d
+        n = len(self._res_index)
+        if n > SENS_REPORT_MAX_ROWS or self.model.plan_method: return None
+        if not messagebox.askyesno("Report", f"Includere l'analisi di sensibilità (±{self._sens_pct:.0%} su D, S, H, L, σ)?"): return None
+        return tornado_rows(self.model.result_rows(), self._sens_pct, self.model.tiers)
+
+    def _selected_index(self):
+        # Riga del modello selezionata nella tabella risultati (None se nessuna)
+        for iid in self.tree.selection():
+            s = self._res_top + int(iid[1:])
+            if s < len(self._res_index): return self._res_index[s]
+        return None
+
     # Grafico
     def _plot_cost_curve(self):
         if not HAS_MPL: messagebox.showwarning("Grafico","Installa matplotlib: pip install matplotlib"); return
-        for w in self.entries:
+        cols = self.model.cols; sel = self._selected_index()
+        for i in ([sel] if sel is not None else []) + list(range(len(self.model))):
             try:
-                D = parse_number(w["D"].get().strip()); S = parse_number(w["S"].get().strip()); H = parse_number(w["H"].get().strip())
+                D = parse_number(cols["D"][i]); S = parse_number(cols["S"][i]); H = parse_number(cols["H"][i])
                 break
             except Exception: continue
         else:
             messagebox.showwarning("Grafico", "Inserisci almeno una riga valida (D, S, H)."); return
-        Qstar = math.sqrt(2.0 * D * S / H); q_min, q_max = max(1.0, Qstar*0.2), Qstar*3.0
-        steps = 80; Qs = [q_min + i*(q_max-q_min)/steps for i in range(steps+1)]
-        TCs = [(D/q)*S + (q/2.0)*H for q in Qs]
-        import matplotlib.pyplot as plt
-        plt.figure(); plt.plot(Qs, TCs, label="Costo totale annuo"); plt.axvline(Qstar, linestyle="--", label=f"EOQ ≈ {Qstar:.2f}")
-        plt.xlabel("Q (quantità per ordine)"); plt.ylabel("Costo totale annuo"); plt.title(f"Curva costi vs Q • {self.brand.get('name','EOQ Pro')}")
+        # Curve in cache (stessi input = nessun ricalcolo), nodi più fitti vicino all'ottimo
+        m = self.model; tiers = m.tiers.get(i)
+        if tiers:
+            # Sconti quantità: curva a tratti (acquisto incluso), Q ottimo dal listino
+            try: Qstar, Qs, TCs = tier_curve(D, S, H, tuple(map(tuple, tiers)), m.holding_rate, m.tier_mode)
+            except ValueError as ex: messagebox.showwarning("Grafico", f"Listino riga {i+1}: {ex}"); return
+        else:
+            Qs, TCs = cost_curve(D, S, H); Qstar = math.sqrt(2.0 * D * S / H)
+        plt = _pyplot()
+        plt.figure(); plt.plot(Qs, TCs, label="Costo totale annuo" + (" (acquisto incluso)" if tiers else "")); plt.axvline(Qstar, linestyle="--", label=f"EOQ ≈ {Qstar:.2f}")
+        for b, _ in (tiers or []):
+            if Qs[0] < b < Qs[-1]: plt.axvline(b, linestyle=":", color="#999")
+        plt.xlabel("Q (quantità per ordine)"); plt.ylabel("Costo totale annuo"); plt.title(f"Curva costi vs Q • riga {i+1} • {self.brand.get('name','EOQ Pro')}")
         plt.legend(); plt.tight_layout(); plt.show()
 
+    def _sensitivity(self):
+        if not self._res_index: messagebox.showwarning("Sensibilità","Calcola prima i risultati."); return
+        if self.model.plan_method:
+            messagebox.showwarning("Sensibilità","Pianificazione multi-periodo attiva: la sensibilità usa l'EOQ per riga.\n"
+                                   "Disattiva la pianificazione (Strumenti → Pianificazione multi-periodo) e riprova."); return
+        pct = simpledialog.askfloat("Sensibilità", "Variazione dei parametri D, S, H, L, σ in % (es. 10):",
+                                    initialvalue=round(self._sens_pct * 100, 2), minvalue=0.1, maxvalue=90.0, parent=self)
+        if pct is None: return
+        self._sens_pct = pct = pct / 100.0
+        p = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")], title="Salva tabella di sensibilità (annulla = solo grafico)")
+        try:
+            if p:
+                self.status.config(text="Analisi di sensibilità in corso…"); self.update_idletasks()
+                with open(p,"w",newline="",encoding="utf-8") as f:
+                    w = csv.writer(f, delimiter=";"); w.writerow(SENS_HEADER)
+                    w.writerows(tornado_rows(self.model.result_rows(), pct, self.model.tiers))
+                self.status.config(text=f"Tabella di sensibilità salvata: {p}")
+            if HAS_MPL: self._plot_tornado(pct)
+            elif not p: messagebox.showwarning("Sensibilità","Installa matplotlib per il grafico: pip install matplotlib")
+        except Exception as ex:
+            messagebox.showerror("Errore sensibilità", str(ex))
+
+    def _plot_tornado(self, pct: float):
+        # Tornado della riga selezionata (o della prima): variazione % di costo totale e ROP per ±pct su ogni parametro
+        i = self._selected_index()
+        r = self.model.results[self._res_index[0] if i is None else i]
+        if r[0] - 1 in self.model.tiers:
+            messagebox.showinfo("Sensibilità", f"Riga {r[0]}: con listino prezzi, non coperta dal tornado (modello EOQ base).\n"
+                                "Usa il grafico costi vs Q per vedere l'effetto delle soglie."); return
+        v = sensitivity([r[1:7]], pct)[0]
+        def delta(j, k):
+            b = 3 + 9 * j + 2 * k; base = v[k]
+            return ((v[b] / base - 1.0) * 100, (v[b + 1] / base - 1.0) * 100) if base else (0.0, 0.0)
+        order = sorted(range(len(SENS_PARAMS)), key=lambda j: max(abs(x) for k in (1, 2) for x in delta(j, k)), reverse=True)
+        labels = [SENS_LABELS[SENS_PARAMS[j]] for j in order]
+        plt = _pyplot(); fig, axes = plt.subplots(1, 2, figsize=(10, 4), sharey=True)
+        for ax, (k, name) in zip(axes, ((1, "Costo totale"), (2, "ROP"))):
+            d = [delta(j, k) for j in order]
+            ax.barh(labels, [x[0] for x in d], label=f"-{pct:.0%}"); ax.barh(labels, [x[1] for x in d], label=f"+{pct:.0%}")
+            ax.axvline(0, color="#666", linewidth=0.8); ax.set_title(name); ax.set_xlabel("variazione %")
+        axes[0].invert_yaxis(); axes[0].legend()
+        fig.suptitle(f"Sensibilità ±{pct:.0%} • riga {r[0]} • {self.brand.get('name','EOQ Pro')}")
+        fig.tight_layout(); plt.show()
+
+    # Simulazione
+    def _simulate(self):
+        if not HAS_NP: messagebox.showwarning("Simulazione","Installa numpy: pip install numpy"); return
+        if not self._res_index: messagebox.showwarning("Simulazione","Calcola prima i risultati."); return
+        if self.model.plan_method:
+            # Nel piano multi-periodo la colonna EOQ è il lotto del periodo (spesso 0): non è una politica (ROP, Q)
+            messagebox.showwarning("Simulazione","Pianificazione multi-periodo attiva: la simulazione richiede l'EOQ per riga.\n"
+                                   "Disattiva la pianificazione (Strumenti → Pianificazione multi-periodo) e riprova."); return
+        days = simpledialog.askinteger("Simulazione", "Giorni simulati per replica:", initialvalue=365, minvalue=30, parent=self)
+        if not days: return
+        reps = simpledialog.askinteger("Simulazione", "Numero di repliche:", initialvalue=200, minvalue=1, parent=self)
+        if not reps: return
+        p = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV","*.csv")], title="Salva risultati simulazione")
+        if not p: return
+        try:
+            from eoq_sim import SIM_HEADER, format_sim, sim_inputs_from_results, simulate_policy   # al primo uso
+            self.status.config(text="Simulazione in corso…"); self.update_idletasks()
+            idx, items, target = sim_inputs_from_results(self.model.result_rows())
+            res = simulate_policy(items, days, reps)
+            with open(p,"w",newline="",encoding="utf-8") as f:
+                w = csv.writer(f, delimiter=";"); w.writerow(SIM_HEADER)
+                w.writerows(format_sim(i, c, r) for i, c, r in zip(idx, target, res))
+            below = sum(1 for c, r in zip(target, res) if r["csl"] < c)
+            fill = sum(r["fill_rate"] for r in res) / len(res)
+            self.status.config(text=f"Simulazione completata: {len(res)} righe.")
+            messagebox.showinfo("Simulazione", f"Righe simulate: {len(res)}\nSotto il CSL obiettivo: {below}\nFill rate medio: {fill:.2%}\n\nDettaglio in:\n{p}")
+        except Exception as ex:
+            self.status.config(text="Simulazione non riuscita.")
+            messagebox.showerror("Errore simulazione", str(ex))
+
+    def _plan(self):
+        # Righe = periodi consecutivi: D domanda del periodo, S setup, H mantenimento per unità a fine periodo
+        if self.model.plan_method:
+            if not messagebox.askyesno("Pianificazione", "Pianificazione multi-periodo attiva. Tornare all'EOQ per riga?"): return
+            self.model.set_plan(None); self._calc(); return
+        ww = messagebox.askyesnocancel("Pianificazione", "Le righe valide sono trattate come periodi consecutivi\n"
+                                       "(D = domanda del periodo, H = mantenimento per unità per periodo).\n\n"
+                                       "Sì = Wagner-Whitin (ottimo)\nNo = Silver-Meal (euristica)")
+        if ww is None: return
+        self.model.set_plan("ww" if ww else "sm"); self._calc()
+        rows = list(self.model.result_rows())
+        if not rows: return
+        orders = sum(1 for r in rows if r[7] > 0); tot = sum(r[10] for r in rows)
+        self.status.config(text=f"Piano {'Wagner-Whitin' if ww else 'Silver-Meal'}: {orders} ordini su {len(rows)} periodi, "
+                                f"costo totale {tot:,.2f}. Colonna EOQ = lotto del periodo.")
+
     # Helpers
     def _confirm(self)->bool:
-        if any(w[k].get().strip() for w in self.entries for k in ("D","S","H","L","sigma","csl")):
+        if self.model.has_data():
             return messagebox.askyesno("Conferma","I dati non salvati andranno persi. Continuare?")
         return True
     def _clear(self):
-        for w in self.entries:
-            for k in ("D","S","H","L","sigma","csl"): w[k].delete(0, tk.END)
-        for i in self.tree.get_children(): self.tree.delete(i)
+        self.model.clear(DEFAULT_ROWS); self._after_load()
         self.status.config(text="Pronto. Default CSL=0.95 (se vuoto).")
     def _set_brand(self):
         win = tk.Toplevel(self); win.title("Imposta brand"); win.resizable(False, False)
@@ -385,14 +588,18 @@ ROP = μ_d * L + Scorta di Sicurezza
             self.brand["logo_path"]=e_logo.get().strip(); win.destroy()
         ttk.Button(win, text="Applica", command=apply).grid(row=3, column=0, columnspan=3, pady=10)
     def _help(self):
-        messagebox.showinfo("Guida rapida","1) Inserisci D, S, H (obbligatori). Opzionali: L, σ, CSL.\n2) Clicca Calcola.\n3) File: Import/Export CSV, Report HTML/PDF, Salva/Apri progetto.\nSuggerimento: se lasci CSL vuoto, uso 0.95.")
+        messagebox.showinfo("Guida rapida","1) Inserisci D, S, H (obbligatori). Opzionali: L, σ, CSL.\n2) Clicca Calcola.\n3) File: Import/Export CSV, Report HTML/PDF, Salva/Apri progetto.\n4) Listino prezzi (riga;qta_min;prezzo): EOQ con sconti quantità; il Totale include l'acquisto.\n5) Strumenti › Pianificazione multi-periodo: righe = periodi, EOQ = lotto ordinato nel periodo (Wagner-Whitin o Silver-Meal).\n6) Strumenti › Analisi di sensibilità: ±x% su D, S, H, L, σ per ogni riga (CSV, grafico tornado, report).\nSuggerimento: se lasci CSL vuoto, uso 0.95.")
     def _about(self):
-        messagebox.showinfo("Info","EOQ Pro • Versione Semplice\nDipendenze opzionali: matplotlib (grafici), reportlab (PDF)")
+        messagebox.showinfo("Info","EOQ Pro • Versione Semplice\nDipendenze opzionali: matplotlib (grafici), reportlab (PDF), pypdf (PDF in parallelo)")
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] and argv[0] in CLI_COMMANDS: return _cli(argv)
+    _mark("main")
     app = EOQProSimple()
     app.mainloop()
 
 if __name__ == "__main__":
+    import multiprocessing; multiprocessing.freeze_support()   # pool PDF nel binario PyInstaller
     main()
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+EOQ Pro - Report (headless)
+---------------------------
+- Report HTML in streaming da un iteratore di righe, opzionalmente paginato
+- Logo codificato una sola volta (cache per percorso + mtime)
+Nessuna dipendenza da tkinter.
+"""
+import base64, os
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO
+
+HTML_HEADERS = ["Riga","D","S","H","L","σ","CSL","EOQ","Costo Ord.","Costo Hold","Totale","ROP","Safety Stock"]
+HTML_CHUNK_ROWS = 2000     # righe <tr> accumulate prima di ogni write()
+HTML_PAGE_ROWS = 20000     # righe per file nel report paginato
+SENS_HTML_HEADERS = ["Riga","Parametro","Variazione","EOQ −","EOQ +","Totale −","Totale +","ROP −","ROP +","Elast. EOQ","Elast. Totale","Elast. ROP"]
+SENS_HTML_TITLE = "<h3>Analisi di sensibilità</h3><div class='small'>Elasticità = variazione % del risultato / variazione % del parametro (modello EOQ base; righe con listino: n/d).</div>"
+
+FORMULAS_HTML = """
+<h3>Formule</h3>
+<div class="code">
+EOQ = sqrt( 2 D S / H )<br>
+Costo Ordinazione = (D / EOQ) * S<br>
+Costo Mantenimento = (EOQ / 2) * H<br>
+Costo Totale = Costo Ordinazione + Costo Mantenimento<br>
+Domanda media giornaliera μ_d = D / 365<br>
+Scorta di Sicurezza = z * σ_d * sqrt(L)<br>
+ROP = μ_d * L + Scorta di Sicurezza
+</div>"""
+
+@lru_cache(maxsize=8)
+def _logo_cached(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "rb") as imgf:
+        b64 = base64.b64encode(imgf.read()).decode("ascii")
+    ext = "png" if path.lower().endswith(".png") else "svg+xml"
+    return f'<img alt="logo" style="height:48px;vertical-align:middle" src="data:image/{ext};base64,{b64}">'
+
+def logo_html(path: Optional[str]) -> str:
+    """Tag <img> con il logo inline; ricodificato solo se il file cambia."""
+    if not path or not os.path.exists(path): return ""
+    try:
+        st = os.stat(path)
+        return _logo_cached(path, st.st_mtime_ns, st.st_size)
+    except Exception:
+        return ""
+
+def _html_head(brand: Dict[str, str], timestamp: str) -> str:
+    primary = brand.get("color","#0F6FFF"); name = brand.get("name","EOQ Pro")
+    head = f"""<!doctype html><html lang='it'><head><meta charset='utf-8'>
+<meta name='viewport' content='width=device-width, initial-scale=1'><title>Report EOQ - {name}</title>
+<style>
+:root {{ --primary: {primary}; }}
+body {{ font-family: Arial, sans-serif; margin: 24px; }}
+.header {{ display:flex; align-items:center; gap:12px; }}
+.brand {{ font-size: 22px; font-weight: 700; color: var(--primary); }}
+table {{ border-collapse: collapse; width: 100%; margin-top: 16px; }}
+th, td {{ border: 1px solid #ddd; padding: 8px; text-align: center; }}
+th {{ background: #f4f4f4; }}
+.small {{ font-size: 12px; color:#666; }}
+.code {{ background:#f8f8f8; padding:8px; border:1px solid #eee; }}
+.nav {{ margin-top: 12px; }}
+</style></head><body>"""
+    header = f"<div class='header'>{logo_html(brand.get('logo_path'))}<div class='brand'>{name}</div></div><div class='small'>Generato il {timestamp}</div>"
+    return head + header
+
+def _write_table(f: TextIO, rows: Iterable[Sequence], chunk_rows: int = HTML_CHUNK_ROWS,
+                 headers: Sequence[str] = HTML_HEADERS) -> int:
+    f.write("<table><tr>" + "".join(f"<th>{h}</th>" for h in headers) + "</tr>\n")
+    it = iter(rows); n = 0
+    while True:
+        chunk = list(islice(it, chunk_rows))
+        if not chunk: break
+        f.write("\n".join("<tr>" + "".join(f"<td>{v}</td>" for v in row) + "</tr>" for row in chunk))
+        f.write("\n"); n += len(chunk)
+    f.write("</table>")
+    return n
+
+def _write_sensitivity(f: TextIO, sensitivity: Optional[Iterable[Sequence]], chunk_rows: int):
+    if sensitivity is None: return
+    f.write(SENS_HTML_TITLE); _write_table(f, sensitivity, chunk_rows, SENS_HTML_HEADERS)
+
+def write_html_report(f: TextIO, rows: Iterable[Sequence], brand: Dict[str, str], timestamp: str,
+                      chunk_rows: int = HTML_CHUNK_ROWS, sensitivity: Optional[Iterable[Sequence]] = None) -> int:
+    """Scrive il report su `f` a blocchi di `chunk_rows` righe; restituisce il numero di righe.
+
+    `sensitivity`: righe tornado (vedi eoq_sens.tornado_rows) in una seconda tabella, opzionale.
+    """
+    f.write(_html_head(brand, timestamp))
+    n = _write_table(f, rows, chunk_rows)
+    _write_sensitivity(f, sensitivity, chunk_rows)
+    f.write(FORMULAS_HTML + "</body></html>")
+    return n
+
+def _page_path(path: str, page: int) -> str:
+    if page == 1: return path
+    base, ext = os.path.splitext(path)
+    return f"{base}_p{page}{ext or '.html'}"
+
+def _nav(path: str, page: int, has_next: bool) -> str:
+    links = []
+    if page > 1: links.append(f"<a href='{os.path.basename(_page_path(path, page - 1))}'>« Pagina {page - 1}</a>")
+    links.append(f"Pagina {page}")
+    if has_next: links.append(f"<a href='{os.path.basename(_page_path(path, page + 1))}'>Pagina {page + 1} »</a>")
+    return "<div class='nav'>" + " | ".join(links) + "</div>"
+
+def write_html_report_paged(path: str, rows: Iterable[Sequence], brand: Dict[str, str], timestamp: str,
+                            page_rows: int = HTML_PAGE_ROWS, chunk_rows: int = HTML_CHUNK_ROWS,
+                            sensitivity: Optional[Iterable[Sequence]] = None) -> List[str]:
+    """Divide il report in più file collegati (report.html, report_p2.html, …) di `page_rows` righe.
+
+    La tabella di sensibilità, se presente, va nell'ultima pagina.
+    """
+    it = iter(rows); paths: List[str] = []; page = 1
+    head = list(islice(it, 1))
+    while True:
+        p = _page_path(path, page); paths.append(p)
+        with open(p, "w", encoding="utf-8") as f:
+            f.write(_html_head(brand, timestamp))
+            _write_table(f, chain(head, islice(it, page_rows - len(head))), chunk_rows)
+            head = list(islice(it, 1))   # una riga di anticipo: serve a sapere se c'è una pagina dopo
+            f.write(_nav(path, page, bool(head)))
+            if not head: _write_sensitivity(f, sensitivity, chunk_rows); f.write(FORMULAS_HTML)
+            f.write("</body></html>")
+        if not head: return paths
+        page += 1
+
+# PDF: template di pagina (brand, logo, intestazione tabella) come form XObject, griglia per pagina
+PDF_HEADERS = ["Riga","D","S","H","L","σ","CSL","EOQ","Ord","Hold","Totale","ROP","SS"]
+PDF_COLW_CM = [1.1,1.7,1.7,1.7,1.4,1.5,1.5,1.8,1.8,1.8,1.8,1.8,1.8]
+PDF_ROW_CM = 0.66
+PDF_PARALLEL_MIN_ROWS = 50000   # sotto questa soglia il pool di processi non conviene
+SENS_PDF_HEADERS = ["Riga","Param.","Var.","EOQ -","EOQ +","Tot. -","Tot. +","ROP -","ROP +","El.EOQ","El.Tot","El.ROP"]
+SENS_PDF_COLW_CM = [1.1,1.3,1.2,1.6,1.6,1.7,1.7,1.5,1.5,1.3,1.3,1.3]
+
+def _hex_to_rgb(h: str):
+    h = h.lstrip("#"); return tuple(int(h[i:i+2],16)/255 for i in (0,2,4))
+
+class PdfReportWriter:
+    """Canvas reportlab che disegna l'intestazione una sola volta (form XObject) e la griglia per pagina."""
+    def __init__(self, path: str, brand: Dict[str, str], timestamp: str):
+        from reportlab.lib.pagesizes import A4  # type: ignore
+        from reportlab.pdfgen import canvas as pdfcanvas  # type: ignore
+        from reportlab.lib.units import cm  # type: ignore
+        self.c = pdfcanvas.Canvas(path, pagesize=A4); self.pages = 0
+        self.brand = brand; self.timestamp = timestamp; self.cm = cm; self._forms = 0
+        self.width, self.height = A4; self.margin = 2 * cm
+        self.rowh = PDF_ROW_CM * cm
+        self.y_head = self.height - self.margin - 26   # riga di intestazione tabella
+        self.y_body = self.y_head - self.rowh          # prima riga dati
+        self.rows_per_page = int((self.y_body - (self.margin + 5 * self.rowh)) // self.rowh) + 1
+        self.table(PDF_HEADERS, PDF_COLW_CM)
+
+    def table(self, headers: Sequence[str], colw_cm: Sequence[float], title: str = "Report EOQ"):
+        """Le pagine successive usano un nuovo template con queste colonne (es. tabella di sensibilità)."""
+        self.xs = [self.margin]
+        for w in colw_cm: self.xs.append(self.xs[-1] + w * self.cm)
+        self.form = f"page{self._forms}"; self._forms += 1
+        self._template(headers, title)
+
+    def _template(self, headers, title):
+        c = self.c; brand = self.brand; cm = self.cm; margin = self.margin; width, height = self.width, self.height
+        y = height - margin; y_head = self.y_head
+        c.beginForm(self.form)
+        c.setFont("Helvetica-Bold", 16); c.setFillColorRGB(*_hex_to_rgb(brand.get("color","#0F6FFF")))
+        c.drawString(margin, y, brand.get("name","EOQ Pro")); c.setFillColorRGB(0,0,0)
+        c.setFont("Helvetica", 9); c.drawString(margin, y - 8, f"{title} • {self.timestamp}")
+        logo = brand.get("logo_path")
+        if logo and os.path.exists(logo) and logo.lower().endswith(".png"):
+            try: c.drawImage(logo, width - margin - 2.5*cm, height - margin - 2.5*cm, 2.5*cm, 2.5*cm, preserveAspectRatio=True, mask='auto')
+            except Exception: pass
+        xs = self.xs
+        c.lines([(xs[0], y_head, xs[-1], y_head), (xs[0], y_head - self.rowh, xs[-1], y_head - self.rowh)] +
+                [(x, y_head - self.rowh, x, y_head) for x in xs])
+        t = c.beginText(); t.setFont("Helvetica-Bold", 8)
+        for x, h in zip(xs, headers): t.setTextOrigin(x + 2, y_head - self.rowh + 2); t.textOut(h)
+        c.drawText(t)
+        c.endForm()
+
+    def page(self, rows: Sequence[Sequence]):
+        c = self.c; xs = self.xs; rowh = self.rowh; y0 = self.y_body
+        c.doForm(self.form)
+        y_end = y0 - len(rows) * rowh
+        c.lines([(xs[0], y0 - i * rowh, xs[-1], y0 - i * rowh) for i in range(1, len(rows) + 1)] +
+                [(x, y_end, x, y0) for x in xs])
+        # Testo per colonna: un'origine per colonna e T* (interlinea = altezza riga) per ogni cella
+        t = c.beginText(); t.setFont("Helvetica", 8, leading=rowh)
+        for j, x in enumerate(xs[:-1]):
+            t.setTextOrigin(x + 2, y0 - rowh + 2)
+            for row in rows: t.textLine(str(row[j])[:18])
+        c.drawText(t); c.showPage(); self.pages += 1
+
+    def save(self) -> int:
+        if not self.pages: self.c.doForm(self.form); self.c.showPage(); self.pages = 1
+        self.c.save(); return self.pages
+
+def _pages(rows: Iterable[Sequence], per_page: int) -> Iterable[List[Sequence]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, per_page))
+        if not chunk: return
+        yield chunk
+
+def _sens_table(w: PdfReportWriter):
+    w.table(SENS_PDF_HEADERS, SENS_PDF_COLW_CM, "Analisi di sensibilità (EOQ base; righe con listino: n/d)")
+
+def _pdf_part(args) -> str:
+    path, pages, brand, timestamp, sens = args
+    w = PdfReportWriter(path, brand, timestamp)
+    if sens: _sens_table(w)
+    for p in pages: w.page(p)
+    w.save(); return path
+
+def write_pdf_report(path: str, rows: Iterable[Sequence], brand: Dict[str, str], timestamp: str,
+                     workers: int = 1, sensitivity: Optional[Iterable[Sequence]] = None) -> int:
+    """Scrive il report PDF da un iteratore di righe; restituisce il numero di pagine.
+
+    Con `workers > 1` (e 'pypdf' installato) le pagine sono divise in intervalli, renderizzate
+    in un pool di processi e poi unite; altrimenti il rendering è sequenziale in streaming.
+    `sensitivity`: righe tornado in coda, con il proprio template di pagina.
+    """
+    if workers > 1:
+        try:
+            from pypdf import PdfWriter  # type: ignore
+        except Exception:
+            workers = 1
+    if workers <= 1:
+        w = PdfReportWriter(path, brand, timestamp)
+        for p in _pages(rows, w.rows_per_page): w.page(p)
+        if sensitivity is not None:
+            _sens_table(w)
+            for p in _pages(sensitivity, w.rows_per_page): w.page(p)
+        return w.save()
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    per_page = PdfReportWriter(os.devnull, brand, timestamp).rows_per_page
+    pages = list(_pages(rows, per_page))
+    if len(pages) < 2 * workers: workers = max(1, len(pages) // 2)
+    step = -(-len(pages) // workers) if pages else 1
+    parts = [(f"{path}.part{i}", pages[i*step:(i+1)*step], brand, timestamp, False) for i in range(workers)]
+    parts = [p for p in parts if p[1]] or [(f"{path}.part0", [], brand, timestamp, False)]
+    sens_pages = list(_pages(sensitivity, per_page)) if sensitivity is not None else []
+    if sens_pages: parts.append((f"{path}.sens", sens_pages, brand, timestamp, True))
+    try:
+        with ProcessPoolExecutor(len(parts), mp_context=multiprocessing.get_context("spawn")) as ex:
+            files = list(ex.map(_pdf_part, parts))
+        out = PdfWriter()
+        for f in files: out.append(f)
+        with open(path, "wb") as fh: out.write(fh)
+    finally:
+        for p in parts:
+            try: os.remove(p[0])
+            except OSError: pass
+    return max(1, len(pages)) + len(sens_pages)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+EOQ Pro - Analisi di sensibilità (headless)
+-------------------------------------------
+- Curve costo totale vs Q: griglia normalizzata Q/Q* con nodi più fitti vicino a Q* (sinh in scala log),
+  valida per ogni riga senza listino perché TC(r Q*) = TC* (r + 1/r) / 2: tutte le righe in un solo
+  prodotto esterno (`cost_curves`) o una riga in cache per i grafici (`cost_curve`)
+- Tornado/elasticità: ±x% su D, S, H, L, σ per tutte le righe con un'unica chiamata a `eoq_batch`
+  (modello EOQ base: le righe con listino sono segnate n/d, il piano multi-periodo non è coperto)
+- Curve e tabelle in cache LRU per tupla di input: grafici ripetuti e what-if istantanei
+NumPy se presente, altrimenti Python puro.
+"""
+import math
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Container, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from eoq_core import HAS_NP, _load_np, eoq_batch
+
+SENS_PARAMS = ("D", "S", "H", "L", "sigma")
+SENS_LABELS = {"D": "D", "S": "S", "H": "H", "L": "L", "sigma": "σ"}
+SENS_PCT = 0.10
+SENS_CHUNK = 65536          # righe per sweep (memoria: 11 scenari per riga)
+SENS_CACHE_SIZE = 65536
+CURVE_POINTS = 101          # dispari: Q* è sempre un nodo
+CURVE_SPAN = 5.0            # Q da Q*/span a Q* × span
+CURVE_CLUSTER = 2.0         # 0 = uniforme in scala log; più alto = nodi più concentrati su Q*
+SENS_HEADER = ["Riga","Parametro","Variazione","EOQ_meno","EOQ_piu","Totale_meno","Totale_piu","ROP_meno","ROP_piu",
+               "Elast_EOQ","Elast_Totale","Elast_ROP"]
+
+class _LRU:
+    """Cache LRU esplicita: a differenza di lru_cache permette di calcolare in blocco solo le chiavi mancanti."""
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize; self._d: "OrderedDict[tuple, object]" = OrderedDict(); self.hits = self.misses = 0
+    def get(self, key: tuple):
+        v = self._d.get(key)
+        if v is None: self.misses += 1
+        else: self._d.move_to_end(key); self.hits += 1
+        return v
+    def put(self, key: tuple, value):
+        self._d[key] = value; self._d.move_to_end(key)
+        if len(self._d) > self.maxsize: self._d.popitem(last=False)
+    def clear(self):
+        self._d.clear(); self.hits = self.misses = 0
+
+_tables = _LRU(SENS_CACHE_SIZE)
+
+def cache_clear():
+    _tables.clear(); cost_curve.cache_clear(); tier_curve.cache_clear()
+
+# Curve costi vs Q
+@lru_cache(maxsize=16)
+def curve_nodes(points: int = CURVE_POINTS, span: float = CURVE_SPAN, cluster: float = CURVE_CLUSTER) -> Tuple[float, ...]:
+    """Rapporti r = Q/Q*: u = ln(span) sinh(a x) / sinh(a), x uniforme in [-1, 1]."""
+    if points < 3 or span <= 1: raise ValueError("almeno 3 punti e span >1")
+    ls = math.log(span); out = []
+    for k in range(points):
+        x = -1.0 + 2.0 * k / (points - 1)
+        u = ls * (math.sinh(cluster * x) / math.sinh(cluster) if cluster > 0 else x)
+        out.append(math.exp(u))
+    return tuple(out)
+
+def cost_curves(D: Sequence[float], S: Sequence[float], H: Sequence[float], points: int = CURVE_POINTS,
+                span: float = CURVE_SPAN, use_numpy: Optional[bool] = None):
+    """(Q, costo totale) di tutte le righe come matrici righe × punti in un solo passaggio.
+
+    Prodotto esterno di Q* e TC* per riga con la griglia normalizzata: nessun ciclo sui punti.
+    Array NumPy se disponibile (o `use_numpy=True`), altrimenti liste di liste.
+    """
+    r = curve_nodes(points, span); f = [(x + 1.0 / x) / 2.0 for x in r]
+    if HAS_NP if use_numpy is None else use_numpy:
+        np = _load_np()
+        D, S, H = (np.asarray(x, dtype=np.float64) for x in (D, S, H))
+        return np.outer(np.sqrt(2.0 * D * S / H), r), np.outer(np.sqrt(2.0 * D * S * H), f)
+    qs = [math.sqrt(2.0 * d * s / h) for d, s, h in zip(D, S, H)]; tcs = [math.sqrt(2.0 * d * s * h) for d, s, h in zip(D, S, H)]
+    return [[q * x for x in r] for q in qs], [[t * x for x in f] for t in tcs]
+
+@lru_cache(maxsize=SENS_CACHE_SIZE)
+def cost_curve(D: float, S: float, H: float, points: int = CURVE_POINTS, span: float = CURVE_SPAN) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Curva di una riga (per i grafici), in cache per tupla di input; stessi nodi di `cost_curves`."""
+    qs = math.sqrt(2.0 * D * S / H); tcs = math.sqrt(2.0 * D * S * H); r = curve_nodes(points, span)
+    return tuple(qs * x for x in r), tuple(tcs * (x + 1.0 / x) / 2.0 for x in r)
+
+@lru_cache(maxsize=256)
+def tier_curve(D: float, S: float, H: float, tiers: Tuple[Tuple[float, float], ...], holding_rate: float = 0.0,
+               mode: str = "all", points: int = CURVE_POINTS, span: float = CURVE_SPAN) -> Tuple[float, Tuple[float, ...], Tuple[float, ...]]:
+    """Curva a tratti con listino (acquisto incluso): nodi adattivi attorno al Q ottimo più ogni soglia di prezzo."""
+    from eoq_solver import price_break_cost, price_break_eoq
+    q_opt = price_break_eoq(D, S, H, tiers, holding_rate, mode)["Q"]
+    q_eoq = math.sqrt(2.0 * D * S / H)
+    lo = min(q_opt, q_eoq) / span; hi = max(q_opt * span, max(b for b, _ in tiers) * 1.5)
+    qs = {q_opt * x for x in curve_nodes(points, span)} | {q_eoq * x for x in curve_nodes(points, span)}
+    for b, _ in tiers:
+        if b > 0: qs.update((math.nextafter(b, 0.0), b))   # salto di prezzo: entrambi i lati
+    Q = tuple(sorted(q for q in qs if lo <= q <= hi))
+    return q_opt, Q, tuple(price_break_cost(D, S, H, tiers, q, holding_rate, mode) for q in Q)
+
+# Tornado / elasticità: scenario 0 = base, poi (-x%, +x%) per ciascun parametro.
+# Riga della tabella: [Q0, TC0, ROP0] + per parametro [Q-, Q+, TC-, TC+, ROP-, ROP+, eQ, eTC, eROP]
+_N_SCEN = 1 + 2 * len(SENS_PARAMS)
+SENS_WIDTH = 3 + 9 * len(SENS_PARAMS)
+
+def _sweep_np(inputs: List[tuple], pct: float) -> List[List[float]]:
+    np = _load_np(); n = len(inputs)
+    base = np.array(inputs, dtype=np.float64)                     # n × 6
+    mult = np.ones((_N_SCEN, 6))
+    for p in range(len(SENS_PARAMS)): mult[1 + 2 * p, p] = 1.0 - pct; mult[2 + 2 * p, p] = 1.0 + pct
+    X = (base[:, None, :] * mult[None, :, :]).reshape(-1, 6)      # (n × scenari) × 6
+    res = eoq_batch(*(X[:, c] for c in range(6)))
+    out = np.empty((n, SENS_WIDTH))
+    for m, k in enumerate(("Q", "cost_total", "rop")):
+        v = res[k].reshape(n, _N_SCEN); f0 = v[:, :1]; lo = v[:, 1::2]; hi = v[:, 2::2]
+        # Elasticità per differenza centrale (f+ - f-) / (2 x f0); 0 se f non cambia (es. ROP con L = 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            e = np.where(hi == lo, 0.0, np.where(f0 != 0, (hi - lo) / (2.0 * pct * f0), np.nan))
+        out[:, m] = v[:, 0]
+        out[:, 3 + 2 * m::9] = lo; out[:, 4 + 2 * m::9] = hi; out[:, 9 + m::9] = e
+    return out.tolist()
+
+def _sweep_py(inputs: List[tuple], pct: float) -> List[List[float]]:
+    cols: List[List[float]] = [[] for _ in range(6)]
+    for row in inputs:
+        for sc in range(_N_SCEN):
+            p, hi = divmod(sc - 1, 2)
+            for c in range(6): cols[c].append(row[c] * (1.0 + (pct if hi else -pct)) if sc and c == p else row[c])
+    res = eoq_batch(*cols, use_numpy=False); out = []
+    for i in range(len(inputs)):
+        v = [res[k][i * _N_SCEN:(i + 1) * _N_SCEN] for k in ("Q", "cost_total", "rop")]
+        row = [v[0][0], v[1][0], v[2][0]]
+        for p in range(len(SENS_PARAMS)):
+            lo, hi = 1 + 2 * p, 2 + 2 * p
+            row += [v[0][lo], v[0][hi], v[1][lo], v[1][hi], v[2][lo], v[2][hi]]
+            row += [0.0 if x[hi] == x[lo] else (x[hi] - x[lo]) / (2.0 * pct * x[0]) if x[0] else math.nan for x in v]
+        out.append(row)
+    return out
+
+def sensitivity(inputs: Sequence[Sequence[float]], pct: float = SENS_PCT) -> List[Sequence[float]]:
+    """Tabella di sensibilità (SENS_WIDTH valori, vedi sopra) per ogni riga (D, S, H, L, sigma, csl).
+
+    Le righe in cache (stessa tupla di input e stesso pct) non vengono ricalcolate; le altre
+    vanno in un unico sweep vettoriale (11 scenari per riga) a blocchi di SENS_CHUNK.
+    """
+    if not (0.0 < pct < 1.0): raise ValueError("variazione tra 0 e 1 (es. 0.1 = ±10%)")
+    keys = [tuple(float(x) for x in row[:6]) + (pct,) for row in inputs]
+    out: List[Optional[Sequence[float]]] = [_tables.get(k) for k in keys]
+    miss = [j for j, v in enumerate(out) if v is None]
+    sweep = _sweep_np if HAS_NP else _sweep_py
+    for a in range(0, len(miss), SENS_CHUNK):
+        part = miss[a:a + SENS_CHUNK]
+        for j, r in zip(part, sweep([keys[j][:6] for j in part], pct)):
+            out[j] = v = array("d", r); _tables.put(keys[j], v)
+    return out
+
+def tornado_rows(results: Iterable[Sequence[float]], pct: float = SENS_PCT, tiered: Container[int] = ()) -> Iterator[List[str]]:
+    """Righe formattate (SENS_HEADER) da tuple risultato; per articolo i parametri sono in ordine di impatto.
+
+    `tiered`: indici riga 0-based con listino (es. `RowModel.tiers`). Il loro EOQ/Totale non è quello del
+    modello base, quindi escono come un'unica riga "listino" con valori n/d invece di numeri incoerenti.
+    """
+    it = iter(results)
+    while True:
+        chunk = [r for _, r in zip(range(SENS_CHUNK), it)]
+        if not chunk: return
+        base = [r for r in chunk if r[0] - 1 not in tiered]
+        tables = dict(zip((r[0] for r in base), sensitivity([r[1:7] for r in base], pct)))
+        for r in chunk:
+            v = tables.get(r[0])
+            if v is None: yield [r[0], "listino", "n/d", *("—",) * (len(SENS_HEADER) - 3)]; continue
+            tc0, rop0 = v[1], v[2]
+            def swing(k):
+                b = 3 + 9 * k
+                return max(abs(v[b + 3] - v[b + 2]) / tc0 if tc0 else 0.0, abs(v[b + 5] - v[b + 4]) / rop0 if rop0 else 0.0)
+            for k in sorted(range(len(SENS_PARAMS)), key=swing, reverse=True):
+                b = 3 + 9 * k
+                yield [r[0], SENS_LABELS[SENS_PARAMS[k]], f"±{pct:.0%}", *(f"{x:.2f}" for x in v[b:b + 6]),
+                       *("—" if x != x else f"{x:.3f}" for x in v[b + 6:b + 9])]
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+EOQ Pro - Simulazione Monte Carlo (headless)
+--------------------------------------------
+- Politica a revisione continua (ROP, Q) simulata giorno per giorno su N giorni e R repliche:
+  domanda uniforme nel giorno, riordino nell'istante in cui la posizione tocca il ROP, arrivo dopo
+  L giorni alla stessa ora (L = 0: arrivo immediato), giacenza media integrata sul tempo
+- Domanda normale/gamma/Poisson, lead time deterministico o stocastico, backorder
+- CSL ottenuto (cicli senza rottura), fill rate, costo medio annuo
+Richiede numpy. Blocchi di articoli vettorializzati (articoli × repliche in un unico vettore),
+distribuiti su un ProcessPoolExecutor con seed deterministico per blocco.
+"""
+import argparse, csv, math, multiprocessing, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eoq_core import HAS_NP, _load_np, compute_rows, iter_csv_rows
+
+DEMAND_DISTS = ("normal", "gamma", "poisson")
+SIM_COLS = ("csl", "fill_rate", "avg_onhand", "orders_per_year", "cost_order", "cost_hold", "cost_total")
+SIM_HEADER = ["Riga","CSL_obiettivo","CSL_ottenuto","Fill_rate","Giacenza_media","Ordini_anno","Costo_ordinazione","Costo_mantenimento","Costo_totale"]
+SIM_CHUNK = 64          # articoli per blocco: unità di seed e di lavoro per i processi
+SIM_MAX_LANES = 50000   # articoli × repliche per blocco (memoria)
+
+# Input per articolo: (D, S, H, L, sigma, Q, rop)
+SimInput = Tuple[float, float, float, float, float, float, float]
+
+def sim_inputs_from_results(results: Iterable[Sequence[float]]) -> Tuple[List[int], List[SimInput], List[float]]:
+    """Da tuple risultato (idx, D, S, H, L, sigma, csl, Q, ord, hold, tot, rop, ss) a input di simulazione."""
+    idx: List[int] = []; inp: List[SimInput] = []; csl: List[float] = []
+    for r in results:
+        idx.append(r[0]); inp.append((r[1], r[2], r[3], r[4], r[5], r[7], r[11])); csl.append(r[6])
+    return idx, inp, csl
+
+def _sim_block(args) -> List[Dict[str, float]]:
+    items, days, reps, seed, block, demand, lt_sigma = args
+    np = _load_np()
+    rng = np.random.default_rng(np.random.SeedSequence([seed, block]))
+    P = np.asarray(items, dtype=np.float64)
+    K = P.shape[0]
+    D, S, H, L, sigma, Q, rop = (np.repeat(P[:, j], reps) for j in range(7))
+    mu = D / 365.0
+    lanes = K * reps
+    Lmax = int(math.ceil(float(P[:, 3].max()) + 6.0 * lt_sigma)) + 2
+    pipe = np.zeros((lanes, Lmax + 1))            # arrivi futuri, buffer circolare sui giorni
+    pipe_f = np.zeros((lanes, Lmax + 1))          # ...e frazione del giorno in cui arrivano
+    NI = rop + Q; IP = NI.copy()                  # giacenza netta e posizione di magazzino
+    cycles = np.zeros(lanes); stock_cycles = np.zeros(lanes); orders = np.zeros(lanes)
+    filled = np.zeros(lanes); total_d = np.zeros(lanes); onhand = np.zeros(lanes)
+    if demand == "gamma":
+        cv2 = np.where(mu > 0, (sigma / np.where(mu > 0, mu, 1.0)) ** 2, 0.0)
+        shape = np.where(cv2 > 0, 1.0 / np.where(cv2 > 0, cv2, 1.0), 1.0); scale = mu * cv2
+    def consume(NI, dseg, d):
+        # Domanda dseg a ritmo costante d/giorno: evasa da scaffale, giacenza × giorni (integrale esatto sul tratto)
+        pos = np.maximum(NI, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            area = np.where(NI >= dseg, (NI - 0.5 * dseg) * np.where(d > 0, dseg / d, 0.0), 0.5 * pos * pos / d)
+        return np.minimum(dseg, pos), np.where(d > 0, area, 0.0)
+    for t in range(days):
+        slot = t % (Lmax + 1)
+        if demand == "poisson": d = rng.poisson(mu).astype(np.float64)
+        elif demand == "gamma": d = np.where(cv2 > 0, rng.gamma(shape, 1.0) * scale, mu)
+        else: d = np.maximum(mu + sigma * rng.standard_normal(lanes), 0.0)
+        # Revisione continua: IP scende con la domanda del giorno e il riordino parte nell'istante in cui tocca il ROP
+        fx = np.ones(lanes); qx = np.zeros(lanes)          # arrivo nello stesso giorno (lead time 0)
+        need = np.flatnonzero(IP - d <= rop)
+        if need.size:
+            f = np.clip((IP[need] - rop[need]) / d[need], 0.0, 1.0)
+            k = np.floor((rop[need] - IP[need] + d[need]) / Q[need]) + 1.0
+            lt = L[need]
+            if lt_sigma > 0: lt = np.clip(np.rint(lt + lt_sigma * rng.standard_normal(need.size)), 0, Lmax - 1)
+            else: lt = np.minimum(np.rint(lt), Lmax - 1)
+            lt = lt.astype(np.intp); qty = k * Q[need]; now = lt == 0
+            fx[need[now]] = f[now]; qx[need[now]] = qty[now]
+            fut = need[~now]; s2 = (t + lt[~now]) % (Lmax + 1)
+            old = pipe[fut, s2]
+            pipe_f[fut, s2] = np.where(old > 0, np.minimum(pipe_f[fut, s2], f[~now]), f[~now])   # più ordini: il primo
+            pipe[fut, s2] = old + qty[~now]
+            IP[need] += qty; orders[need] += k
+        IP -= d
+        # Fino a due arrivi nel giorno (da ordini passati e ordine di oggi con lead time 0), in ordine di frazione
+        qa = pipe[:, slot].copy(); fa = np.where(qa > 0, pipe_f[:, slot], 1.0); pipe[:, slot] = 0.0
+        first = fa <= fx
+        f1 = np.where(first, fa, fx); q1 = np.where(first, qa, qx); f2 = np.where(first, fx, fa); q2 = np.where(first, qx, qa)
+        prev = 0.0
+        for fe, qe in ((f1, q1), (f2, q2), (1.0, None)):
+            dseg = d * (fe - prev); prev = fe
+            got, area = consume(NI, dseg, d); filled += got; onhand += area; NI -= dseg
+            if qe is None: break
+            arr = qe > 0
+            cycles += arr; stock_cycles += arr & (NI < -1e-9 * Q); NI += qe   # tolleranza: L = 0 arriva a NI = 0 esatto
+        total_d += d
+    years = days / 365.0
+    def per_sku(a): return a.reshape(K, reps).sum(axis=1)
+    cyc = per_sku(cycles); so = per_sku(stock_cycles)
+    csl = np.where(cyc > 0, 1.0 - so / np.where(cyc > 0, cyc, 1.0), np.nan)
+    td = per_sku(total_d)
+    fill = np.where(td > 0, per_sku(filled) / np.where(td > 0, td, 1.0), 1.0)
+    avg_on = per_sku(onhand) / (days * reps)
+    opy = per_sku(orders) / (years * reps)
+    c_ord = opy * P[:, 1]; c_hold = avg_on * P[:, 2]
+    cols = (csl, fill, avg_on, opy, c_ord, c_hold, c_ord + c_hold)
+    return [dict(zip(SIM_COLS, (float(c[i]) for c in cols))) for i in range(K)]
+
+def simulate_policy(items: Sequence[SimInput], days: int = 365, reps: int = 200, seed: int = 0,
+                    demand: str = "normal", lt_sigma: float = 0.0, workers: Optional[int] = None,
+                    chunk: int = SIM_CHUNK) -> List[Dict[str, float]]:
+    """Simula la politica (Q, ROP) di ogni articolo; un dizionario SIM_COLS per articolo.
+
+    Gli articoli sono divisi in blocchi fissi di `chunk` (ridotti se articoli × repliche supera
+    SIM_MAX_LANES); il seed del blocco b è SeedSequence([seed, b]), quindi il risultato non
+    dipende dal numero di processi. `workers` None = tutti i core, 1 = nello stesso processo.
+    """
+    if not HAS_NP: raise RuntimeError("La simulazione richiede numpy (pip install numpy)")
+    if demand not in DEMAND_DISTS: raise ValueError(f"distribuzione domanda sconosciuta: {demand}")
+    if days <= 0 or reps <= 0: raise ValueError("giorni e repliche >0 richiesti")
+    for it in items:
+        D, S, H, L, sigma, Q, rop = it
+        if not (D > 0 and S > 0 and H > 0 and L >= 0 and sigma >= 0 and Q > 0): raise ValueError(f"input non valido: {it}")
+    chunk = max(1, min(chunk, SIM_MAX_LANES // reps))
+    blocks = [(list(items[b:b + chunk]), days, reps, seed, b // chunk, demand, lt_sigma) for b in range(0, len(items), chunk)]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 1 or len(blocks) <= 1:
+        parts = [_sim_block(a) for a in blocks]
+    else:
+        with ProcessPoolExecutor(min(workers, len(blocks)), mp_context=multiprocessing.get_context("spawn")) as ex:
+            parts = list(ex.map(_sim_block, blocks))
+    return [r for p in parts for r in p]
+
+def format_sim(idx: int, target_csl: float, r: Dict[str, float]) -> List[str]:
+    return [idx, f"{target_csl:.3f}", f"{r['csl']:.4f}", f"{r['fill_rate']:.4f}", f"{r['avg_onhand']:.2f}",
+            f"{r['orders_per_year']:.2f}", f"{r['cost_order']:.2f}", f"{r['cost_hold']:.2f}", f"{r['cost_total']:.2f}"]
+
+def cli_simulate(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="eoq_pro.py simulate", description="Valida ROP/scorta di sicurezza con simulazione Monte Carlo.")
+    ap.add_argument("input", help="CSV D;S;H;L;sigma;csl")
+    ap.add_argument("output", help="CSV risultati simulazione")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--reps", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--demand", choices=DEMAND_DISTS, default="normal")
+    ap.add_argument("--lt-sigma", type=float, default=0.0, help="deviazione standard del lead time (giorni)")
+    ap.add_argument("--workers", type=int, default=None)
+    a = ap.parse_args(argv)
+    t0 = time.perf_counter(); errors: List[str] = []
+    try:
+        with open(a.input, "r", encoding="utf-8", newline="") as f:
+            idx, items, target = sim_inputs_from_results(compute_rows(iter_csv_rows(f), errors=errors))
+        for e in errors[:20]: print(e, file=sys.stderr)
+        res = simulate_policy(items, a.days, a.reps, a.seed, a.demand, a.lt_sigma, a.workers)
+        with open(a.output, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f, delimiter=";"); w.writerow(SIM_HEADER)
+            w.writerows(format_sim(i, c, r) for i, c, r in zip(idx, target, res))
+    except (OSError, RuntimeError, ValueError) as ex:   # file, numpy mancante, parametri non validi
+        print(f"Errore: {ex}", file=sys.stderr); return 2
+    below = sum(1 for c, r in zip(target, res) if r["csl"] < c)
+    print(f"Articoli: {len(res)}  sotto il CSL obiettivo: {below}  tempo: {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+    return 0
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+EOQ Pro - Modelli multi-articolo (headless)
+-------------------------------------------
+- EOQ con vincolo di capacità/budget: moltiplicatore di Lagrange trovato per bisezione
+- Joint replenishment (JRP): ciclo comune T per fornitore e multipli interi k_i per articolo
+NumPy se presente (tutti gli articoli in un passaggio per iterazione), altrimenti Python puro.
+"""
+import math
+from typing import Dict, List, Optional, Sequence
+
+import eoq_core
+from eoq_core import HAS_NP, _load_np
+
+def _use_np(use_numpy: Optional[bool]) -> bool:
+    return HAS_NP if use_numpy is None else use_numpy
+
+# EOQ vincolato: sum(w_i * Q_i) <= limit
+# Q_i(λ) = sqrt(2 D_i S_i / (H_i + 2 λ w_i)) è decrescente in λ: si cerca λ ≥ 0 con la bisezione.
+
+def constrained_eoq(D: Sequence[float], S: Sequence[float], H: Sequence[float], w: Sequence[float],
+                    limit: float, tol: float = 1e-9, max_iter: int = 200,
+                    use_numpy: Optional[bool] = None) -> Dict[str, object]:
+    """EOQ per tutti gli articoli con vincolo condiviso sum(w_i Q_i) <= limit.
+
+    `w` è lo spazio (capacità magazzino) o il prezzo unitario (budget per ordine) di ciascun
+    articolo. Restituisce le colonne Q, cost_order, cost_hold, cost_total più `lambda` (costo
+    ombra per unità di w), `used` (= sum w Q) e `binding` (vincolo attivo).
+    """
+    if limit <= 0: raise ValueError("limite <=0")
+    if _use_np(use_numpy): return _constrained_np(D, S, H, w, limit, tol, max_iter)
+    return _constrained_py(D, S, H, w, limit, tol, max_iter)
+
+def _lagrange(used, limit: float, tol: float, max_iter: int) -> float:
+    # λ minimo con used(λ) <= limit: raddoppio fino a un estremo ammissibile, poi bisezione
+    if used(0.0) <= limit: return 0.0
+    lo, hi = 0.0, 1.0
+    while used(hi) > limit: lo, hi = hi, hi * 2.0
+    for _ in range(max_iter):
+        lam = 0.5 * (lo + hi)
+        if used(lam) > limit: lo = lam
+        else: hi = lam
+        if hi - lo <= tol * max(1.0, hi): break
+    return hi   # lato ammissibile
+
+def _constrained_np(D, S, H, w, limit, tol, max_iter):
+    np = _load_np()
+    D, S, H, w = (np.asarray(x, dtype=np.float64) for x in (D, S, H, w))
+    if not ((D > 0).all() and (S > 0).all() and (H > 0).all() and (w >= 0).all()): raise ValueError("D, S, H >0 e w >=0 richiesti")
+    two_ds = 2.0 * D * S
+    used = lambda lam: float(w @ np.sqrt(two_ds / (H + 2.0 * lam * w)))
+    lam = _lagrange(used, limit, tol, max_iter)
+    Q = np.sqrt(two_ds / (H + 2.0 * lam * w))
+    c_ord, c_hold, c_tot = eoq_core.eoq_costs(D, S, H, Q)
+    return {"Q": Q, "cost_order": c_ord, "cost_hold": c_hold, "cost_total": c_tot,
+            "lambda": lam, "used": float(w @ Q), "binding": lam > 0.0}
+
+def _constrained_py(D, S, H, w, limit, tol, max_iter):
+    D, S, H, w = ([float(x) for x in c] for c in (D, S, H, w))
+    if not all(d > 0 and s > 0 and h > 0 and x >= 0 for d, s, h, x in zip(D, S, H, w)): raise ValueError("D, S, H >0 e w >=0 richiesti")
+    two_ds = [2.0 * d * s for d, s in zip(D, S)]
+    def qs(lam): return [math.sqrt(a / (h + 2.0 * lam * x)) for a, h, x in zip(two_ds, H, w)]
+    def used(lam): return sum(x * q for x, q in zip(w, qs(lam)))
+    lam = _lagrange(used, limit, tol, max_iter)
+    Q = qs(lam)
+    costs = [eoq_core.eoq_costs(d, s, h, q) for d, s, h, q in zip(D, S, H, Q)]
+    c_ord, c_hold, c_tot = (list(c) for c in zip(*costs)) if costs else ([], [], [])
+    return {"Q": Q, "cost_order": c_ord, "cost_hold": c_hold, "cost_total": c_tot,
+            "lambda": lam, "used": sum(x * q for x, q in zip(w, Q)), "binding": lam > 0.0}
+
+# Joint replenishment: per ogni gruppo (fornitore) costo fisso maggiore S0 ogni T, articolo i ordinato ogni k_i*T.
+# Iterazione classica: k_i = min k con k(k+1) >= 2 s_i / (D_i H_i T²), poi T = sqrt(2 (S0 + Σ s_i/k_i) / Σ k_i D_i H_i).
+
+def joint_replenishment(D: Sequence[float], s: Sequence[float], H: Sequence[float], S0,
+                        group: Optional[Sequence[int]] = None, max_iter: int = 100,
+                        use_numpy: Optional[bool] = None) -> Dict[str, object]:
+    """Ciclo comune per gruppo e multipli interi per articolo (heuristica iterativa di Silver).
+
+    `s` sono i costi di ordinazione minori per articolo, `S0` il costo maggiore (scalare o uno
+    per gruppo, indicizzato dall'id del gruppo 0..G-1). Senza `group` tutti gli articoli sono
+    un unico gruppo. Restituisce per articolo k, Q (= k T D), cost_order (s/kT), cost_hold
+    (k T D H / 2), e per gruppo T e cost_total (incluso S0/T). Gruppi senza articoli: T NaN, cost_total 0.
+    """
+    if _use_np(use_numpy): return _jrp_np(D, s, H, S0, group, max_iter)
+    return _jrp_py(D, s, H, S0, group, max_iter)
+
+def _k_for(x: float) -> int:
+    # minimo intero k >= 1 con k(k+1) >= x
+    k = max(1, math.ceil((-1.0 + math.sqrt(1.0 + 4.0 * x)) / 2.0))
+    while k > 1 and (k - 1) * k >= x: k -= 1
+    return k
+
+def _jrp_np(D, s, H, S0, group, max_iter):
+    np = _load_np()
+    D, s, H = (np.asarray(x, dtype=np.float64) for x in (D, s, H))
+    if not ((D > 0).all() and (s >= 0).all() and (H > 0).all()): raise ValueError("D, H >0 e s >=0 richiesti")
+    g = np.zeros(D.shape[0], dtype=np.intp) if group is None else np.asarray(group, dtype=np.intp)
+    G = int(g.max()) + 1 if g.size else 0
+    S0 = np.broadcast_to(np.asarray(S0, dtype=np.float64), (G,)).copy()
+    DH = D * H
+    k = np.ones_like(D)
+    with np.errstate(divide="ignore", invalid="ignore"):   # gruppi senza articoli: T = NaN, cost_total = 0
+        return _jrp_np_loop(np, D, s, DH, S0, g, G, k, max_iter)
+
+def _jrp_np_loop(np, D, s, DH, S0, g, G, k, max_iter):
+    for _ in range(max_iter):
+        T = np.sqrt(2.0 * (S0 + np.bincount(g, s / k, G)) / np.bincount(g, k * DH, G))
+        x = 2.0 * s / (DH * T[g] ** 2)
+        k_new = np.maximum(1.0, np.ceil((-1.0 + np.sqrt(1.0 + 4.0 * x)) / 2.0))
+        k_new = np.where((k_new > 1) & ((k_new - 1) * k_new >= x), k_new - 1, k_new)   # arrotondamenti float
+        if np.array_equal(k_new, k): break
+        k = k_new
+    T = np.sqrt(2.0 * (S0 + np.bincount(g, s / k, G)) / np.bincount(g, k * DH, G))
+    empty = np.bincount(g, minlength=G) == 0; T[empty] = np.nan
+    Tg = T[g]
+    c_ord = s / (k * Tg); c_hold = k * Tg * DH / 2.0
+    total = np.where(empty, 0.0, S0 / T) + np.bincount(g, c_ord + c_hold, G)
+    return {"k": k.astype(np.int64), "Q": k * Tg * D, "cost_order": c_ord, "cost_hold": c_hold,
+            "T": T, "cost_total": total}
+
+def _jrp_py(D, s, H, S0, group, max_iter):
+    D, s, H = ([float(x) for x in c] for c in (D, s, H))
+    if not all(d > 0 and m >= 0 and h > 0 for d, m, h in zip(D, s, H)): raise ValueError("D, H >0 e s >=0 richiesti")
+    n = len(D); g = [0] * n if group is None else [int(x) for x in group]
+    G = max(g) + 1 if g else 0
+    S0 = [float(S0)] * G if isinstance(S0, (int, float)) else [float(x) for x in S0]
+    DH = [d * h for d, h in zip(D, H)]
+    k = [1] * n
+    def cycle(k: List[int]) -> List[float]:
+        num = S0[:]; den = [0.0] * G
+        for i in range(n): num[g[i]] += s[i] / k[i]; den[g[i]] += k[i] * DH[i]
+        return [math.sqrt(2.0 * a / b) if b > 0 else math.nan for a, b in zip(num, den)]   # gruppo vuoto: NaN
+    for _ in range(max_iter):
+        T = cycle(k)
+        k_new = [_k_for(2.0 * s[i] / (DH[i] * T[g[i]] ** 2)) for i in range(n)]
+        if k_new == k: break
+        k = k_new
+    T = cycle(k)
+    c_ord = [s[i] / (k[i] * T[g[i]]) for i in range(n)]
+    c_hold = [k[i] * T[g[i]] * DH[i] / 2.0 for i in range(n)]
+    total = [0.0 if T[j] != T[j] else S0[j] / T[j] for j in range(G)]
+    for i in range(n): total[g[i]] += c_ord[i] + c_hold[i]
+    return {"k": k, "Q": [k[i] * T[g[i]] * D[i] for i in range(n)], "cost_order": c_ord, "cost_hold": c_hold,
+            "T": T, "cost_total": total}
+
+# Sconti quantità. Listino per articolo: [(qta_min, prezzo_unitario), ...] con prezzi non crescenti.
+# Mantenimento per unità/anno = H + i * prezzo (H fisso, i = tasso sul valore).
+# - "all": il prezzo del tier si applica a tutte le unità; TC = D p + D S / Q + h Q / 2
+# - "incremental": ogni prezzo solo alle unità nel suo intervallo; C(Q) = R_j + p_j (Q - b_j), primo tier da 0
+TIER_MODES = ("all", "incremental")
+
+def _check_tiers(tiers: Sequence[Sequence[float]], mode: str = "all") -> List[tuple]:
+    t = sorted((float(b), float(p)) for b, p in tiers)
+    if not t: raise ValueError("listino vuoto")
+    if t[0][0] < 0 or any(p <= 0 for _, p in t): raise ValueError("quantità <0 o prezzo <=0 nel listino")
+    # Incrementale: senza prezzo per le prime unità il costo cumulato R non è definito
+    if mode == "incremental" and t[0][0] > 0: raise ValueError("listino incrementale: il primo tier deve partire da 0")
+    if any(t[j + 1][1] > t[j][1] for j in range(len(t) - 1)): raise ValueError("prezzi del listino non decrescenti")
+    return t
+
+def _tier_cost(D, S, H, i, mode, b, p, R, Q):
+    # (acquisto, ordinazione, mantenimento) annui per Q nel tier (b, p) con costo cumulato R fino a b
+    if mode == "all": return D * p, D * S / Q, (H + i * p) * Q / 2.0
+    C = R + p * (Q - b)
+    return D * C / Q, D * S / Q, (H * Q + i * C) / 2.0
+
+def price_break_eoq(D: float, S: float, H: float, tiers: Sequence[Sequence[float]],
+                    holding_rate: float = 0.0, mode: str = "all") -> Dict[str, float]:
+    """EOQ con sconti quantità per un articolo.
+
+    Tutte le unità: i tier sono visitati dal prezzo più basso e ci si ferma al primo EOQ
+    ammissibile (i tier più cari non possono fare meglio). Incrementale: un candidato per tier.
+    """
+    if mode not in TIER_MODES: raise ValueError(f"modalità sconto sconosciuta: {mode}")
+    t = _check_tiers(tiers, mode)
+    if D <= 0 or S <= 0: raise ValueError("D, S >0 richiesti")
+    if H + holding_rate * t[-1][1] <= 0: raise ValueError("costo di mantenimento <=0")
+    R = [0.0]
+    for j in range(len(t) - 1): R.append(R[-1] + t[j][1] * (t[j + 1][0] - t[j][0]))
+    best = None
+    order = range(len(t) - 1, -1, -1) if mode == "all" else range(len(t))
+    for j in order:
+        b, p = t[j]; hi = t[j + 1][0] if j + 1 < len(t) else math.inf
+        fixed = S if mode == "all" else S + R[j] - p * b
+        q = math.sqrt(2.0 * D * fixed / (H + holding_rate * p))
+        qc = min(max(q, b), math.nextafter(hi, 0.0)) if q > 0 else max(b, 1e-12)
+        costs = _tier_cost(D, S, H, holding_rate, mode, b, p, R[j], qc)
+        tot = sum(costs)
+        if best is None or tot < best[0]: best = (tot, qc, j, costs)
+        if mode == "all" and b <= q < hi: break
+    tot, Q, j, (c_buy, c_ord, c_hold) = best
+    return {"Q": Q, "tier": j, "price": t[j][1], "cost_purchase": c_buy, "cost_order": c_ord,
+            "cost_hold": c_hold, "cost_total": tot}
+
+def price_break_cost(D: float, S: float, H: float, tiers: Sequence[Sequence[float]], Q: float,
+                     holding_rate: float = 0.0, mode: str = "all") -> float:
+    """Costo totale annuo (acquisto incluso) per un Q qualsiasi: per la curva costi vs Q."""
+    t = _check_tiers(tiers, mode); R = 0.0; j = 0
+    while j + 1 < len(t) and Q >= t[j + 1][0]:
+        R += t[j][1] * (t[j + 1][0] - t[j][0]); j += 1
+    return sum(_tier_cost(D, S, H, holding_rate, mode, t[j][0], t[j][1], R, Q))
+
+def tiers_to_csr(tiers_per_item: Sequence[Sequence[Sequence[float]]]):
+    """Listini irregolari -> (qta_min, prezzi, offset) piatti, come per `price_break_batch`."""
+    breaks: List[float] = []; prices: List[float] = []; offsets = [0]
+    for t in tiers_per_item:
+        for b, p in t: breaks.append(float(b)); prices.append(float(p))
+        offsets.append(len(breaks))
+    return breaks, prices, offsets
+
+PRICE_BREAK_COLS = ("Q", "price", "cost_purchase", "cost_order", "cost_hold", "cost_total")
+
+def price_break_batch(D: Sequence[float], S: Sequence[float], H: Sequence[float], breaks: Sequence[float],
+                      prices: Sequence[float], offsets: Sequence[int], holding_rate: float = 0.0,
+                      mode: str = "all", use_numpy: Optional[bool] = None) -> Dict[str, object]:
+    """Sconti quantità per un intero catalogo con listini di lunghezza variabile.
+
+    I listini sono passati in forma piatta: i tier dell'articolo k sono `breaks/prices[offsets[k]:offsets[k+1]]`
+    (vedi `tiers_to_csr`). Con NumPy tutte le coppie (articolo, tier) sono valutate insieme e il minimo
+    per articolo è preso con `minimum.reduceat`. Righe non valide: NaN e `ok` False.
+    """
+    if mode not in TIER_MODES: raise ValueError(f"modalità sconto sconosciuta: {mode}")
+    if _use_np(use_numpy): return _price_break_np(D, S, H, breaks, prices, offsets, holding_rate, mode)
+    n = len(D); nan = float("nan")
+    out: Dict[str, list] = {k: [nan] * n for k in PRICE_BREAK_COLS}; out["tier"] = [-1] * n; ok = [False] * n
+    for k in range(n):
+        tiers = list(zip(breaks[offsets[k]:offsets[k + 1]], prices[offsets[k]:offsets[k + 1]]))
+        try: r = price_break_eoq(float(D[k]), float(S[k]), float(H[k]), tiers, holding_rate, mode)
+        except (TypeError, ValueError): continue
+        for c in PRICE_BREAK_COLS: out[c][k] = r[c]
+        out["tier"][k] = r["tier"]; ok[k] = True
+    out["ok"] = ok
+    return out
+
+def _price_break_np(D, S, H, breaks, prices, offsets, i, mode):
+    np = _load_np()
+    D, S, H = (np.asarray(x, dtype=np.float64) for x in (D, S, H))
+    b = np.asarray(breaks, dtype=np.float64); p = np.asarray(prices, dtype=np.float64)
+    off = np.asarray(offsets, dtype=np.intp); n = D.shape[0]
+    counts = np.diff(off); item = np.repeat(np.arange(n), counts)
+    order = np.lexsort((b, item)); b = b[order]; p = p[order]
+    last = off[1:][counts > 0] - 1
+    hi = np.empty_like(b); hi[:-1] = b[1:]; hi[last] = np.inf
+    start = np.repeat(off[:-1], counts)                     # primo tier dell'articolo, per coppia
+    # Validità per articolo: almeno un tier, prezzi >0 e non crescenti, qta >=0 (incrementale: primo tier da 0)
+    bad_pair = (p <= 0) | (b < 0)
+    bad_pair[:-1] |= (p[1:] > p[:-1]) & (item[1:] == item[:-1])
+    if mode == "incremental": bad_pair |= (np.arange(b.size) == start) & (b > 0)
+    ok = (counts > 0) & (D > 0) & (S > 0) & (np.bincount(item, bad_pair, n) == 0)
+    Di, Si, Hi = D[item], S[item], H[item]
+    h = Hi + i * p
+    ok &= np.bincount(item, h <= 0, n) == 0
+    good = ok[item]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if mode == "all":
+            R = np.zeros_like(b); fixed = Si
+        else:
+            seg = np.where(np.isinf(hi), 0.0, p * (hi - b))
+            cs = np.cumsum(seg) - seg                       # cumulato esclusivo su tutto il vettore
+            R = cs - cs[start]                              # ...azzerato all'inizio di ogni articolo
+            fixed = Si + R - p * b
+        q = np.sqrt(2.0 * Di * fixed / h)
+        qc = np.clip(np.where(q > 0, q, 0.0), np.maximum(b, 1e-12), np.nextafter(hi, 0.0))
+        if mode == "all":
+            buy = Di * p; c_ord = Di * Si / qc; c_hold = h * qc / 2.0
+        else:
+            C = R + p * (qc - b)
+            buy = Di * C / qc; c_ord = Di * Si / qc; c_hold = (Hi * qc + i * C) / 2.0
+        tc = np.where(good, buy + c_ord + c_hold, np.inf)
+    res = {k: np.full(n, np.nan) for k in PRICE_BREAK_COLS}; tier = np.full(n, -1, dtype=np.int64)
+    nz = counts > 0
+    if b.size:
+        tc_min = np.full(n, np.inf); tc_min[nz] = np.minimum.reduceat(tc, off[:-1][nz])
+        is_min = np.flatnonzero((tc == tc_min[item]) & good)
+        items, first = np.unique(item[is_min], return_index=True)
+        sel = is_min[first]
+        for k, v in (("Q", qc), ("price", p), ("cost_purchase", buy), ("cost_order", c_ord), ("cost_hold", c_hold), ("cost_total", tc)):
+            res[k][items] = v[sel]
+        tier[items] = sel - off[:-1][items]
+    res["tier"] = tier; res["ok"] = ok
+    return res
+
+# Lot sizing multi-periodo: domanda d_t, setup S_t e mantenimento h_t (per unità rimasta a fine periodo t).
+# Ordinare in i per coprire i..j costa S_i + sum_k d_k (Hc_k - Hc_i), Hc = mantenimento cumulato.
+# Wagner-Whitin: F(j) = A_j + min_i (b_i - Hc_i Dc_j) con A, Dc cumulati -> rette di pendenza -Hc_i
+# non crescente interrogate in Dc_j non decrescente: inviluppo con coda monotona, O(n) ammortizzato.
+LOT_METHODS = ("ww", "sm")
+LOT_COLS = ("Q", "inventory", "cost_order", "cost_hold", "cost_total")
+
+def _lot_inputs(d, S, H) -> tuple:
+    n = len(d); d = [float(x) for x in d]
+    S = [float(S)] * n if isinstance(S, (int, float)) else [float(x) for x in S]
+    H = [float(H)] * n if isinstance(H, (int, float)) else [float(x) for x in H]
+    if len(S) != n or len(H) != n: raise ValueError("d, S, H di lunghezza diversa")
+    if any(not (x >= 0) for x in d) or any(not (x >= 0) for x in S) or any(not (x >= 0) for x in H):
+        raise ValueError("d, S, H >=0 richiesti")
+    return d, S, H
+
+def wagner_whitin(d: Sequence[float], S, H) -> List[float]:
+    """Quantità ordinate per periodo del piano ottimo (S, H scalari o per periodo)."""
+    d, S, H = _lot_inputs(d, S, H); n = len(d)
+    Hc = [0.0] * (n + 1); Dc = [0.0] * (n + 1); A = [0.0] * (n + 1)
+    for t in range(n):
+        Hc[t + 1] = Hc[t] + H[t]; Dc[t + 1] = Dc[t] + d[t]; A[t + 1] = A[t] + d[t] * Hc[t]
+    F = [0.0] * (n + 1); arg = [0] * (n + 1)
+    # Retta dell'ordine in i (1-based): y = b_i + m_i x, m_i = -Hc[i-1], x = Dc_j
+    qm: List[float] = []; qb: List[float] = []; qi: List[int] = []; head = 0
+    def useless(m1, b1, m2, b2, m3, b3) -> bool:
+        # la retta centrale non è mai sotto le altre due (pendenze m1 >= m2 >= m3)
+        return (b3 - b1) * (m1 - m2) <= (b2 - b1) * (m1 - m3)
+    for j in range(1, n + 1):
+        m = -Hc[j - 1]; b = F[j - 1] + S[j - 1] - A[j - 1] - m * Dc[j - 1]
+        if len(qm) > head and qm[-1] == m:
+            if qb[-1] <= b: m = None
+            else: qm.pop(); qb.pop(); qi.pop()
+        if m is not None:
+            while len(qm) - head >= 2 and useless(qm[-2], qb[-2], qm[-1], qb[-1], m, b):
+                qm.pop(); qb.pop(); qi.pop()
+            qm.append(m); qb.append(b); qi.append(j); head = min(head, len(qm) - 1)
+        if Dc[j] == 0.0:
+            F[j] = 0.0; arg[j] = 0; continue          # nessuna domanda finora: nessun ordine
+        x = Dc[j]
+        while len(qm) - head >= 2 and qb[head + 1] + qm[head + 1] * x <= qb[head] + qm[head] * x: head += 1
+        F[j] = A[j] + qb[head] + qm[head] * x; arg[j] = qi[head]
+    Q = [0.0] * n; j = n
+    while j > 0 and arg[j]:
+        i = arg[j]; Q[i - 1] = Dc[j] - Dc[i - 1]; j = i - 1
+    return Q
+
+def silver_meal(d: Sequence[float], S, H) -> List[float]:
+    """Euristica Silver-Meal: si estende l'ordine finché il costo medio per periodo scende."""
+    d, S, H = _lot_inputs(d, S, H); n = len(d)
+    Q = [0.0] * n; i = 0
+    while i < n:
+        if d[i] == 0.0: i += 1; continue
+        cost = S[i]; hold = 0.0; qty = d[i]; j = i + 1
+        while j < n:
+            hold += H[j - 1]; c = cost + d[j] * hold
+            if c / (j - i + 1) > cost / (j - i): break
+            cost = c; qty += d[j]; j += 1
+        Q[i] = qty; i = j
+    return Q
+
+def lot_plan(d: Sequence[float], S, H, method: str = "ww") -> Dict[str, List[float]]:
+    """Piano per periodo: Q ordinata, giacenza a fine periodo e costi (ordinazione S se Q>0, mantenimento h × giacenza)."""
+    if method not in LOT_METHODS: raise ValueError(f"metodo di lot sizing sconosciuto: {method}")
+    d, S, H = _lot_inputs(d, S, H)
+    Q = (wagner_whitin if method == "ww" else silver_meal)(d, S, H)
+    out: Dict[str, List[float]] = {k: [] for k in LOT_COLS}; inv = 0.0
+    for t in range(len(d)):
+        inv = max(inv + Q[t] - d[t], 0.0)
+        c_ord = S[t] if Q[t] > 0 else 0.0; c_hold = H[t] * inv
+        out["Q"].append(Q[t]); out["inventory"].append(inv)
+        out["cost_order"].append(c_ord); out["cost_hold"].append(c_hold); out["cost_total"].append(c_ord + c_hold)
+    return out
+
+def lot_plan_batch(d: Sequence[float], S: Sequence[float], H: Sequence[float], offsets: Sequence[int],
+                   method: str = "ww") -> Dict[str, List[float]]:
+    """Piani per molti articoli in forma piatta: periodi dell'articolo k = `d/S/H[offsets[k]:offsets[k+1]]`."""
+    out: Dict[str, List[float]] = {k: [] for k in LOT_COLS}
+    for k in range(len(offsets) - 1):
+        a, b = offsets[k], offsets[k + 1]
+        p = lot_plan(d[a:b], S[a:b], H[a:b], method)
+        for c in LOT_COLS: out[c].extend(p[c])
+    return out
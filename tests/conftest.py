@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+import os, sys
+
+# Moduli in root (nessun pacchetto installabile): il repo va nel path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+from bench_eoq import compare
+
+def _r(sec, peak=1.0, n=1000): return {"rows": n, "seconds": sec, "rows_per_sec": n / sec, "peak_mb": peak}
+
+def test_compare_flags_slowdown():
+    assert len(compare({"a@1000": _r(0.5)}, {"a@1000": _r(0.1)}, 0.25)) == 1
+    assert compare({"a@1000": _r(0.11)}, {"a@1000": _r(0.1)}, 0.25) == []
+
+def test_compare_skips_fast_and_missing_cases():
+    base = {"fast@1000": _r(0.001), "old@1000": _r(0.1)}
+    assert compare({"fast@1000": _r(0.004), "new@1000": _r(9.0)}, base, 0.25) == []
+    assert len(compare({"fast@1000": _r(0.004)}, base, 0.25, min_seconds=0.0)) == 1
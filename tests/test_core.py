@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import io
+
+import pytest
+
+from eoq_core import NONFINITE_MSG, RowModel, cli_batch, compute_rows, iter_csv_rows, parse_row, run_batch
+
+CSV = ("D;S;H;L;sigma;csl\n100;1;1\nnan;1;1\ninf;1;1\n5;5;5\nx;1;1\n1;nan;2\n7;7;7\n"
+       "10;1;1;nan\n10;1;1;inf\n10;1;1;2;nan\n10;1;1;2;inf\n10;1;1;2;1;nan\n10;1;1;2;1;inf\n10;1;1;2;1;0,9\n")
+VALID = [1, 4, 7, 14]
+NONFINITE = [2, 3, 6, 8, 9, 10, 11, 12, 13]
+
+def test_compute_rows_rejects_nonfinite():
+    errors = []
+    rows = list(compute_rows(iter_csv_rows(io.StringIO(CSV)), errors=errors))
+    assert [r[0] for r in rows] == VALID
+    assert sorted(errors) == sorted([f"Riga {i}: {NONFINITE_MSG}" for i in NONFINITE] +
+                                    ["Riga 5: could not convert string to float: 'x'"])
+
+def test_parse_row_rejects_nonfinite_optional_columns():
+    for raw in (["1", "1", "1", "nan", "", ""], ["1", "1", "1", "", "inf", ""], ["1", "1", "1", "", "", "nan"]):
+        with pytest.raises(ValueError, match=NONFINITE_MSG): parse_row(raw)
+    assert parse_row(["1", "1", "1", "", "", ""])[3:] == (0.0, 0.0, 0.95)
+
+def test_run_batch_counts():
+    stats = run_batch(io.StringIO(CSV), io.StringIO())
+    assert (stats["rows"], stats["valid"], stats["errors"]) == (14, len(VALID), 14 - len(VALID))
+
+def test_recompute_rejects_nonfinite():
+    m = RowModel(); m.load(iter_csv_rows(io.StringIO(CSV))); m.recompute()
+    assert all(m.errors[i - 1] == NONFINITE_MSG for i in NONFINITE)
+    assert [r[0] for r in m.result_rows()] == VALID
+
+def test_cli_batch_missing_input(tmp_path, capsys):
+    assert cli_batch([str(tmp_path / "manca.csv"), str(tmp_path / "out.csv")]) == 2
+    assert capsys.readouterr().err.startswith("Errore:")
+
+def test_cli_batch_bad_output(tmp_path, capsys):
+    src = tmp_path / "in.csv"; src.write_text(CSV, encoding="utf-8")
+    assert cli_batch([str(src), str(tmp_path / "manca" / "out.csv")]) == 2
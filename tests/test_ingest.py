@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from eoq_core import RowModel, iter_csv_rows
+from eoq_ingest import ingest_csv, sniff_csv
+
+LINES = ["D;S;H;L;sigma;csl",
+         "100;5;1;2;1;0,95", "100;5;1;2;1;nan", "100;5;1;2;1;inf", "100;5;1;nan;1;0.9", "100;5;1;2;inf;0.9",
+         "100;5;1;2;nan", "100;5;1", "", ";;;;;", "nan;5;1", "inf;5;1", "100;0;1", "100;5;-1", "100;5;1;-2",
+         "100;5;1;2;1;0,4", "100;5;1;2;1;1", "x;5;1", "100;5;1;;;", "1,5;2,5;0,5;3;0,5;0,99", "100;5",
+         " 7 ; 8 ; 9 ", "1e3;5;1;2;1;0.9", "100;5;1;2;1;0.95;extra"]
+
+def _write(tmp_path, newline="\n", bom=False):
+    p = tmp_path / "in.csv"
+    p.write_bytes((b"\xef\xbb\xbf" if bom else b"") + (newline.join(LINES) + newline).encode("utf-8"))
+    return p
+
+@pytest.mark.parametrize("newline,bom,chunk", [("\n", False, 1 << 20), ("\r\n", True, 1 << 20), ("\n", True, 40), ("\r\n", False, 17)])
+def test_ingest_matches_recompute(tmp_path, newline, bom, chunk):
+    p = _write(tmp_path, newline, bom)
+    model, st = ingest_csv(str(p), workers=1, chunk_bytes=chunk)
+    ref = RowModel()
+    with open(p, "r", encoding="utf-8-sig", newline="") as f: ref.load(iter_csv_rows(f))
+    ref.recompute()
+    assert len(model) == len(ref) == len(LINES) - 1
+    assert model.errors == ref.errors
+    assert list(model.result_rows()) == list(ref.result_rows())
+    assert (st["rows"], st["valid"], st["errors"]) == (len(ref), len(list(ref.result_rows())), len(ref.errors))
+    if chunk < 100: assert st["chunks"] > 1
+
+def test_literal_nan_csl_is_an_error(tmp_path):
+    p = tmp_path / "n.csv"; p.write_text("100;5;1;2;1;nan\n100;5;1;2;1;\n", encoding="utf-8")
+    model, _ = ingest_csv(str(p), workers=1)
+    assert 0 in model.errors and 1 not in model.errors
+    assert model.row(0)[5] == "nan" and model.row(1)[5] == ""
+
+def test_sniff_csv():
+    assert sniff_csv("a;b;c\n1,5;2;3\n") == ";"
+    assert sniff_csv("a\tb\n1\t2\n") == "\t"
+    assert sniff_csv("a,b,c\n1,2,3\n") == ","
+    assert sniff_csv("") == ";"
+
+def test_ingest_parallel_matches_serial(tmp_path):
+    p = _write(tmp_path, "\n", True)
+    a, _ = ingest_csv(str(p), workers=1, chunk_bytes=64); b, st = ingest_csv(str(p), workers=2, chunk_bytes=64)
+    assert st["chunks"] > 1 and a.errors == b.errors and list(a.result_rows()) == list(b.result_rows())
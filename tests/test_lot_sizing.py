@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import io
+import random
+
+import pytest
+
+from eoq_core import PLAN_BLOCKED_MSG, RowModel, iter_csv_rows
+from eoq_solver import lot_plan, silver_meal, wagner_whitin
+
+def _brute(d, S, H):
+    # DP O(n²) diretta: F(j) = min_i F(i-1) + setup in i (se serve) + mantenimento di d_i..d_j dal periodo i
+    n = len(d); F = [0.0] + [float("inf")] * n
+    for j in range(1, n + 1):
+        for i in range(1, j + 1):
+            hold = sum(d[k - 1] * sum(H[t - 1] for t in range(i, k)) for k in range(i, j + 1))
+            F[j] = min(F[j], F[i - 1] + (S[i - 1] if any(d[i - 1:j]) else 0.0) + hold)
+    return F[n]
+
+def _instances():
+    r = random.Random(7)
+    yield [10, 0, 0, 5], [50] * 4, [1] * 4
+    yield [0, 0, 3], [5, 5, 5], [2, 2, 2]
+    yield [], [], []
+    for _ in range(200):
+        n = r.randint(1, 14)
+        d = [0.0 if r.random() < 0.2 else float(r.randint(1, 100)) for _ in range(n)]
+        S = [float(r.choice((0, 10, 50, 200))) for _ in range(n)]
+        H = [r.choice((0.0, 0.5, 1.0, 3.0)) for _ in range(n)]
+        yield d, S, H
+
+@pytest.mark.parametrize("d,S,H", list(_instances()))
+def test_wagner_whitin_matches_brute_force(d, S, H):
+    opt = _brute(d, S, H)
+    ww = lot_plan(d, S, H, "ww"); sm = lot_plan(d, S, H, "sm")
+    assert sum(ww["cost_total"]) == pytest.approx(opt, abs=1e-9)
+    assert sum(sm["cost_total"]) >= opt - 1e-9
+    for Q in (wagner_whitin(d, S, H), silver_meal(d, S, H)):
+        assert sum(Q) == pytest.approx(sum(d)) and all(sum(Q[:t + 1]) >= sum(d[:t + 1]) - 1e-9 for t in range(len(d)))
+
+def test_plan_blocked_by_error_rows():
+    m = RowModel(); m.load(iter_csv_rows(io.StringIO("D;S;H\n10;50;1\nx;50;1\n5;50;1\n")))
+    m.set_plan("ww"); m.recompute()
+    assert m.errors[0] == m.errors[2] == PLAN_BLOCKED_MSG and m.errors[1] != PLAN_BLOCKED_MSG
+    assert list(m.result_rows()) == []
+    m.set(1, "D", "0,5"); m.recompute()
+    assert not m.errors and [r[7] for r in m.result_rows()] == pytest.approx([15.5, 0.0, 0.0])
+
+def test_plan_blocked_by_bad_tiers():
+    m = RowModel(); m.load(iter_csv_rows(io.StringIO("D;S;H\n10;50;1\n5;50;1\n")))
+    m.set_tiers({1: [(10, 5.0)]}, "incremental"); m.set_plan("sm"); m.recompute()
+    assert m.errors[0] == PLAN_BLOCKED_MSG and m.errors[1] != PLAN_BLOCKED_MSG
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import io
+import struct
+
+import pytest
+
+from eoq_core import PROJECT_MAGIC, RowModel, iter_csv_rows, open_project_bin, save_project_bin
+
+CSV = "D;S;H;L;sigma;csl\n100;5;2;3;1.5;0.9\n;;\nx;5;2\n250;10;1\n0;1;1\n40;2;0.5;7;;0.99\n"
+
+def _model() -> RowModel:
+    m = RowModel(); m.load(iter_csv_rows(io.StringIO(CSV))); m.recompute()
+    return m
+
+def _snapshot(m: RowModel):
+    return [m.row(i) for i in range(len(m))], list(m.result_rows()), dict(m.errors), sorted(m.dirty)
+
+def test_round_trip(tmp_path):
+    m = _model(); p = str(tmp_path / "p.eoqp")
+    save_project_bin(p, m, {"brand": "x"})
+    m2, meta = open_project_bin(p)
+    assert meta["brand"] == "x" and m2.source == p
+    assert _snapshot(m2) == _snapshot(m)
+    assert m2.row(2) == ["x", "5", "2", "", "", ""]                  # testo della cella non numerica
+    assert m2.errors[2] == m.errors[2] and m2.errors[4] == m.errors[4]
+    assert m2.recompute() == []                                      # risultati in cache: niente da ricalcolare
+
+def test_round_trip_dirty_rows_are_recomputed(tmp_path):
+    m = _model(); m.set(3, "D", "500"); p = str(tmp_path / "p.eoqp")
+    save_project_bin(p, m)
+    m2, _ = open_project_bin(p)
+    assert m2.dirty == {3} and m2.results[3] is None
+    m.recompute(); m2.recompute()
+    assert list(m2.result_rows()) == list(m.result_rows())
+
+def test_round_trip_tiers_and_plan(tmp_path):
+    m = _model(); m.set_tiers({0: [(0, 10.0), (50, 9.0)]}, "incremental", 0.2); m.recompute()
+    p = str(tmp_path / "t.eoqp"); save_project_bin(p, m)
+    m2, _ = open_project_bin(p)
+    assert (m2.tiers, m2.tier_mode, m2.holding_rate, m2.plan_method) == ({0: [(0.0, 10.0), (50.0, 9.0)]}, "incremental", 0.2, None)
+    assert list(m2.result_rows()) == list(m.result_rows())
+    m.set(2, "D", "10"); m.set(4, "D", "20"); m.set_plan("sm"); m.recompute(); save_project_bin(p, m)
+    m3, _ = open_project_bin(p)
+    assert m3.plan_method == "sm" and list(m3.result_rows()) == list(m.result_rows())
+
+def test_empty_model(tmp_path):
+    p = str(tmp_path / "e.eoqp"); save_project_bin(p, RowModel())
+    m, _ = open_project_bin(p)
+    assert len(m) == 0 and list(m.result_rows()) == [] and m.errors == {}
+
+def test_save_over_mmap_source(tmp_path):
+    m = _model(); p = str(tmp_path / "p.eoqp"); save_project_bin(p, m)
+    m2, _ = open_project_bin(p)
+    m2.materialize(); m2.set(0, "D", "400"); m2.append(["9", "9", "9", "", "", ""]); m2.recompute()
+    assert m2.source is None
+    save_project_bin(p, m2)
+    m3, _ = open_project_bin(p)
+    assert _snapshot(m3) == _snapshot(m2) and m3.row(0)[0] == "400" and len(m3) == len(m) + 1
+
+def test_rejects_bad_files(tmp_path):
+    p = tmp_path / "p.eoqp"; save_project_bin(str(p), _model())
+    data = p.read_bytes()
+    bad = tmp_path / "bad.eoqp"
+    for blob, msg in ((data[:-8], "troncato"), (data[:10], "corto"), (b"", "corto"),
+                      (b"XXXX" + data[4:], "non è un progetto"),
+                      (struct.pack("<4sH", PROJECT_MAGIC, 99) + data[6:], "versione")):
+        bad.write_bytes(blob)
+        with pytest.raises(ValueError, match=msg): open_project_bin(str(bad))
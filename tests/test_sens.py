@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import io
+import math
+
+import pytest
+
+import eoq_sens
+from eoq_core import HAS_NP, RowModel, eoq_only, iter_csv_rows, rop_and_safety
+from eoq_sens import (SENS_HEADER, SENS_PARAMS, SENS_WIDTH, cost_curve, cost_curves, curve_nodes, sensitivity,
+                      tornado_rows)
+
+PATHS = [False, True] if HAS_NP else [False]
+ROWS = [(1000.0, 50.0, 2.0, 5.0, 3.0, 0.95), (36500.0, 10.0, 0.5, 0.0, 0.0, 0.9), (12.0, 400.0, 7.0, 30.0, 0.2, 0.99)]
+
+def _elast(f, x, pct=0.1):
+    return (f(x * (1 + pct)) - f(x * (1 - pct))) / (2 * pct * f(x))
+
+def test_sensitivity_elasticities():
+    eoq_sens.cache_clear()
+    for (D, S, H, L, sg, c), v in zip(ROWS, sensitivity(ROWS, 0.1)):
+        assert len(v) == SENS_WIDTH
+        Q, _, _, TC = eoq_only(D, S, H); rop = rop_and_safety(D, L, sg, c)[0]
+        assert (v[0], v[1], v[2]) == pytest.approx((Q, TC, rop))
+        e = {p: v[3 + 9 * k + 6:3 + 9 * k + 9] for k, p in enumerate(SENS_PARAMS)}   # (EOQ, Totale, ROP)
+        assert e["D"][0] == pytest.approx(0.5, abs=0.005) and e["S"][0] == pytest.approx(0.5, abs=0.005)
+        assert e["H"][0] == pytest.approx(-0.5, abs=0.005) and e["H"][1] == pytest.approx(0.5, abs=0.005)
+        assert e["D"][0] == pytest.approx(_elast(math.sqrt, 1.0), rel=1e-9)
+        assert e["H"][0] == pytest.approx(_elast(lambda h: 1 / math.sqrt(h), 1.0), rel=1e-9)
+        assert e["L"][0] == e["L"][1] == e["sigma"][0] == e["sigma"][1] == 0.0
+        if rop:
+            assert e["D"][2] == pytest.approx(_elast(lambda d: rop_and_safety(d, L, sg, c)[0], D), rel=1e-9)
+        else:
+            assert e["L"][2] == 0.0                                    # L = 0: ROP non cambia
+
+@pytest.mark.skipif(not HAS_NP, reason="numpy assente")
+def test_sensitivity_paths_agree():
+    inputs = [r + (0.1,) for r in ROWS]
+    a = eoq_sens._sweep_np([r[:6] for r in inputs], 0.1); b = eoq_sens._sweep_py([r[:6] for r in inputs], 0.1)
+    for x, y in zip(a, b): assert x == pytest.approx(y, rel=1e-12, nan_ok=True)
+
+def test_sensitivity_cache():
+    eoq_sens.cache_clear()
+    first = sensitivity(ROWS[:1]); again = sensitivity(ROWS[:1])
+    assert first[0] is again[0] and eoq_sens._tables.hits == 1
+    with pytest.raises(ValueError): sensitivity(ROWS, 1.5)
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_cost_curves_match_eoq(use_numpy):
+    D, S, H = ([r[c] for r in ROWS] for c in range(3))
+    Qs, TCs = cost_curves(D, S, H, use_numpy=use_numpy)
+    mid = len(curve_nodes()) // 2
+    for k, (d, s, h) in enumerate(zip(D, S, H)):
+        q, tc = list(Qs[k]), list(TCs[k])
+        Q, _, _, TC = eoq_only(d, s, h)
+        assert q[mid] == pytest.approx(Q) and tc[mid] == pytest.approx(TC) and min(tc) == pytest.approx(TC)
+        assert tc == pytest.approx([d * s / x + h * x / 2 for x in q], rel=1e-12)
+        one_q, one_tc = cost_curve(d, s, h)
+        assert q == pytest.approx(list(one_q), rel=1e-12) and tc == pytest.approx(list(one_tc), rel=1e-12)
+
+def test_tornado_marks_tiered_rows():
+    m = RowModel(); m.load(iter_csv_rows(io.StringIO("D;S;H;L;sigma;csl\n1000;50;2;5;3;0,95\n500;20;1;2;1;0,9\n")))
+    m.set_tiers({0: [(0, 10.0), (500, 9.0)]}, "all", 0.2); m.recompute()
+    rows = list(tornado_rows(m.result_rows(), 0.1, m.tiers))
+    assert rows[0][:3] == [1, "listino", "n/d"] and set(rows[0][3:]) == {"—"} and len(rows[0]) == len(SENS_HEADER)
+    assert [r[0] for r in rows[1:]] == [2] * len(SENS_PARAMS)
+    assert len(list(tornado_rows(m.result_rows(), 0.1))) == 2 * len(SENS_PARAMS)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import eoq_sim
+from eoq_core import HAS_NP, eoq_only, rop_and_safety
+from eoq_sim import cli_simulate, simulate_policy
+
+needs_np = pytest.mark.skipif(not HAS_NP, reason="numpy assente")
+
+def _item(D, S, H, L, sigma, csl):
+    rop, _ = rop_and_safety(D, L, sigma, csl)
+    return (D, S, H, L, sigma, eoq_only(D, S, H)[0], rop)
+
+@needs_np
+def test_zero_lead_time_never_stocks_out():
+    # L = 0: riordino e arrivo nello stesso istante in cui la posizione tocca ROP = 0
+    r = simulate_policy([_item(3650, 50, 2, 0, 3, 0.95)], 365, 100, workers=1)[0]
+    assert r["csl"] == 1.0 and r["fill_rate"] == pytest.approx(1.0)
+
+@needs_np
+def test_csl_close_to_target():
+    r = simulate_policy([_item(3650, 50, 2, 5, 3, 0.95), _item(36500, 10, 2, 5, 30, 0.98)], 365, 400, workers=1)
+    assert r[0]["csl"] == pytest.approx(0.95, abs=0.02) and r[1]["csl"] == pytest.approx(0.98, abs=0.01)
+
+@needs_np
+def test_workers_do_not_change_results():
+    items = [_item(1000 + 500 * k, 20, 1 + k % 3, k % 4, 2.0, 0.95) for k in range(5)]
+    one = simulate_policy(items, 120, 20, seed=3, workers=1, chunk=2)
+    many = simulate_policy(items, 120, 20, seed=3, workers=2, chunk=2)
+    assert one == many
+
+def test_cli_simulate_missing_input(tmp_path, capsys):
+    assert cli_simulate([str(tmp_path / "manca.csv"), str(tmp_path / "out.csv")]) == 2
+    assert capsys.readouterr().err.startswith("Errore:")
+
+def test_cli_simulate_without_numpy(tmp_path, capsys, monkeypatch):
+    src = tmp_path / "in.csv"; src.write_text("D;S;H;L;sigma;csl\n100;5;1;2;1;0.95\n", encoding="utf-8")
+    monkeypatch.setattr(eoq_sim, "HAS_NP", False)
+    assert cli_simulate([str(src), str(tmp_path / "out.csv")]) == 2
+    assert "numpy" in capsys.readouterr().err
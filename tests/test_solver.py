@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import math
+
+import pytest
+
+from eoq_core import HAS_NP
+from eoq_solver import (TIER_MODES, constrained_eoq, joint_replenishment, price_break_batch, price_break_cost, price_break_eoq,
+                         tiers_to_csr)
+
+PATHS = [False, True] if HAS_NP else [False]
+
+# EOQ vincolato
+ITEMS = ([1200, 300, 5000, 80], [50, 20, 100, 10], [2, 1, 0.5, 4], [3.0, 1.0, 0.5, 2.0])
+
+def _eoq(D, S, H): return [math.sqrt(2 * d * s / h) for d, s, h in zip(D, S, H)]
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_constrained_eoq_binding(use_numpy):
+    D, S, H, w = ITEMS
+    free = sum(x * q for x, q in zip(w, _eoq(D, S, H))); limit = free * 0.5
+    r = constrained_eoq(D, S, H, w, limit, use_numpy=use_numpy)
+    assert r["binding"] and r["lambda"] > 0 and r["used"] <= limit and r["used"] == pytest.approx(limit, rel=1e-6)
+    Q = list(r["Q"]); lam = r["lambda"]
+    assert Q == pytest.approx([math.sqrt(2 * d * s / (h + 2 * lam * x)) for d, s, h, x in zip(D, S, H, w)])
+    # Ammissibile e non peggiore dell'EOQ libero ridotto in proporzione fino al limite
+    scaled = [q * limit / free for q in _eoq(D, S, H)]
+    assert sum(r["cost_total"]) <= sum(d * s / q + h * q / 2 for d, s, h, q in zip(D, S, H, scaled))
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_constrained_eoq_not_binding(use_numpy):
+    D, S, H, w = ITEMS
+    r = constrained_eoq(D, S, H, w, 1e9, use_numpy=use_numpy)
+    assert r["lambda"] == 0.0 and not r["binding"]
+    assert list(r["Q"]) == pytest.approx(_eoq(D, S, H))
+
+@pytest.mark.skipif(not HAS_NP, reason="numpy assente")
+@pytest.mark.parametrize("frac", [0.1, 0.5, 0.99, 2.0])
+def test_constrained_eoq_paths_agree(frac):
+    D, S, H, w = ITEMS
+    limit = frac * sum(x * q for x, q in zip(w, _eoq(D, S, H)))
+    a = constrained_eoq(D, S, H, w, limit, use_numpy=False); b = constrained_eoq(D, S, H, w, limit, use_numpy=True)
+    assert a["lambda"] == pytest.approx(b["lambda"], rel=1e-12, abs=0) and a["binding"] == b["binding"]
+    for k in ("Q", "cost_order", "cost_hold", "cost_total"):
+        assert list(a[k]) == pytest.approx(list(b[k]), rel=1e-12)
+
+def test_constrained_eoq_rejects_bad_input():
+    with pytest.raises(ValueError): constrained_eoq([1], [1], [1], [1], 0)
+    with pytest.raises(ValueError): constrained_eoq([1], [1], [0], [1], 10, use_numpy=False)
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_jrp_empty_group(use_numpy):
+    r = joint_replenishment([100, 200, 50], [5, 5, 5], [1, 2, 1], [50, 40, 30], group=[0, 0, 2], use_numpy=use_numpy)
+    T, tot = list(r["T"]), list(r["cost_total"])
+    assert math.isnan(T[1]) and tot[1] == 0.0
+    assert all(t > 0 and math.isfinite(t) for t in (T[0], T[2], tot[0], tot[2]))
+
+@pytest.mark.skipif(not HAS_NP, reason="numpy assente")
+def test_jrp_paths_agree():
+    args = ([100, 200, 50, 10], [5, 1, 8, 2], [1, 2, 1, 3], [50, 0, 30], [0, 0, 2, 2])
+    a = joint_replenishment(*args[:4], group=args[4], use_numpy=False)
+    b = joint_replenishment(*args[:4], group=args[4], use_numpy=True)
+    for k in ("k", "Q", "T", "cost_total"):
+        assert list(a[k]) == pytest.approx(list(b[k]), nan_ok=True)
+
+# Sconti quantità: percorso scalare, batch Python e batch NumPy contro una scansione esaustiva di Q
+CATALOG = [(1000, 50, 2, [(0, 10), (500, 9), (1000, 8.5)]),
+           (200, 20, 1, [(0, 5)]),
+           (5000, 100, 0.5, [(0, 3), (100, 2.9), (2000, 2.5), (8000, 2.4)]),
+           (10, 5, 4, [(0, 100), (50, 60)])]
+
+def _scan(D, S, H, tiers, rate, mode):
+    top = max(b for b, _ in tiers) * 3 + 10 * math.sqrt(2 * D * S / H)
+    qs = [top * (k / 20000) ** 2 for k in range(1, 20001)] + [b for b, _ in tiers if b > 0]
+    return min(price_break_cost(D, S, H, tiers, q, rate, mode) for q in qs)
+
+@pytest.mark.parametrize("mode", TIER_MODES)
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_price_break_matches_scan(mode, use_numpy):
+    rate = 0.2
+    br, pr, off = tiers_to_csr([t for *_, t in CATALOG])
+    D, S, H = ([r[c] for r in CATALOG] for c in range(3))
+    res = price_break_batch(D, S, H, br, pr, off, rate, mode, use_numpy=use_numpy)
+    for k, (d, s, h, tiers) in enumerate(CATALOG):
+        one = price_break_eoq(d, s, h, tiers, rate, mode)
+        assert bool(res["ok"][k])
+        assert float(res["cost_total"][k]) == pytest.approx(one["cost_total"], rel=1e-9)
+        assert float(res["Q"][k]) == pytest.approx(one["Q"], rel=1e-9)
+        assert one["cost_total"] == pytest.approx(price_break_cost(d, s, h, tiers, one["Q"], rate, mode), rel=1e-9)
+        assert one["cost_total"] <= _scan(d, s, h, tiers, rate, mode) * (1 + 1e-9)
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_price_break_incremental_rejects_first_tier_above_zero(use_numpy):
+    tiers = [(100, 10), (500, 9)]
+    with pytest.raises(ValueError): price_break_eoq(1000, 50, 2, tiers, 0.2, "incremental")
+    with pytest.raises(ValueError): price_break_cost(1000, 50, 2, tiers, 200, 0.2, "incremental")
+    assert price_break_eoq(1000, 50, 2, tiers, 0.2, "all")["Q"] >= 100
+    br, pr, off = tiers_to_csr([tiers, [(0, 10)]])
+    res = price_break_batch([1000, 1000], [50, 50], [2, 2], br, pr, off, 0.2, "incremental", use_numpy=use_numpy)
+    assert list(map(bool, res["ok"])) == [False, True] and math.isnan(float(res["Q"][0]))
+
+@pytest.mark.parametrize("mode", TIER_MODES)
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_price_break_empty_tier_list(mode, use_numpy):
+    br, pr, off = tiers_to_csr([[(0, 10), (500, 9)], [], [(0, 4)], []])
+    res = price_break_batch([1000, 100, 100, 5], [50, 5, 5, 5], [2, 1, 1, 1], br, pr, off, 0.2, mode, use_numpy=use_numpy)
+    assert list(map(bool, res["ok"])) == [True, False, True, False]
+    assert float(res["cost_total"][0]) == pytest.approx(price_break_eoq(1000, 50, 2, [(0, 10), (500, 9)], 0.2, mode)["cost_total"])
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.skipif(find_spec("tkinter") is None, reason="tkinter assente")
+def test_gui_import_skips_process_pools():
+    # Avvio rapido: import CSV e simulazione caricano multiprocessing solo al primo uso
+    code = ("import sys, eoq_pro; heavy = ('multiprocessing', 'concurrent.futures.process', 'eoq_ingest', 'eoq_sim'); "
+            "print(','.join(m for m in heavy if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == ""